@@ -13,23 +13,35 @@ from app.repositories.stats_repository import StatsRepository
 from app.services.shortener import ShortenedURLService
 from app.services.stats import StatsService
 from app.services.cleanup import CleanupService
-from app.core.config import settings
 
+# Repositories and services hold no per-request state, so a single shared
+# instance of each is built at import time and handed out by the providers.
+_url_repository = URLRepository()
+_stats_repository = StatsRepository()
+_shortener_service = ShortenedURLService(url_repository=_url_repository)
+_stats_service = StatsService(
+    stats_repository=_stats_repository,
+    url_repository=_url_repository,
+)
+_cleanup_service = CleanupService(url_repository=_url_repository)
 
-async def get_url_repository():
-    """Get an instance of the URL repository."""
-    return URLRepository()
 
+async def get_url_repository() -> URLRepository:
+    """Get the shared URL repository instance."""
+    return _url_repository
 
-async def get_stats_repository():
-    """Get an instance of the stats repository."""
-    return StatsRepository()
+
+async def get_stats_repository() -> StatsRepository:
+    """Get the shared stats repository instance."""
+    return _stats_repository
 
 
 async def get_shortener_service(
     url_repo: URLRepository = Depends(get_url_repository),
 ) -> ShortenedURLService:
-    """Get an instance of the URL shortening service."""
+    """Get the URL shortening service bound to the given repository."""
+    if url_repo is _url_repository:
+        return _shortener_service
     return ShortenedURLService(url_repository=url_repo)
 
 
@@ -37,17 +49,16 @@ async def get_stats_service(
     stats_repo: StatsRepository = Depends(get_stats_repository),
     url_repo: URLRepository = Depends(get_url_repository),
 ) -> StatsService:
-    """Get an instance of the statistics service."""
+    """Get the statistics service bound to the given repositories."""
+    if stats_repo is _stats_repository and url_repo is _url_repository:
+        return _stats_service
     return StatsService(stats_repository=stats_repo, url_repository=url_repo)
 
 
 async def get_cleanup_service(
     url_repo: URLRepository = Depends(get_url_repository),
 ) -> CleanupService:
-    """Get an instance of the cleanup service."""
+    """Get the cleanup service bound to the given repository."""
+    if url_repo is _url_repository:
+        return _cleanup_service
     return CleanupService(url_repository=url_repo)
-
-
-def get_base_url():
-    """Get the base URL for shortened links."""
-    return settings.BASE_URL
@@ -1,42 +1,29 @@
 """Common API parameter definitions.
 
 This module provides reusable parameter definitions for FastAPI endpoints.
+Each definition is an ``Annotated`` type alias sharing a single ``Query``
+instance; endpoints set the default value in their own signature.
 """
 
+from typing import Annotated
+
 from fastapi import Query
-from typing import Optional
 
 
-def LimitParam(default: int = 20) -> int:
-    """
-    Common limit parameter for pagination.
-    
-    Args:
-        default: Default limit value
-        
-    Returns:
-        A Query parameter with validation
-    """
-    return Query(
-        default, 
-        ge=1, 
-        le=100, 
-        description="Number of records to return"
-    )
+# Common limit parameter for pagination, e.g. ``limit: Limit = 20``
+Limit = Annotated[
+    int,
+    Query(ge=1, le=100, description="Number of records to return")
+]
 
+# Common skip parameter for pagination, e.g. ``skip: Skip = 0``
+Skip = Annotated[
+    int,
+    Query(ge=0, description="Number of records to skip")
+]
 
-def SkipParam(default: int = 0) -> int:
-    """
-    Common skip parameter for pagination.
-    
-    Args:
-        default: Default skip value
-        
-    Returns:
-        A Query parameter with validation
-    """
-    return Query(
-        default, 
-        ge=0, 
-        description="Number of records to skip"
-    ) 
\ No newline at end of file
+# Flag controlling whether expired URLs are listed, e.g. ``include_expired: IncludeExpired = False``
+IncludeExpired = Annotated[
+    bool,
+    Query(description="Include expired URLs")
+]
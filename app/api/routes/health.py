@@ -1,19 +1,83 @@
 """Health check endpoints for monitoring application status."""
 
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+from fastapi import APIRouter, status
 import time
 import os
 import sys
 import asyncio
 
 from app.core.config import settings
-from app.db.session import get_db
+from app.db.base import database_probe
 from app.core.redis import redis_manager
 
 router = APIRouter(tags=["health"])
 
+# Disk usage changes slowly, so the statvfs result is reused between probes
+DISK_STATS_TTL_SECONDS = 30.0
+_disk_stats_cache = {"expires_at": 0.0, "value": None}
+
+
+def _get_disk_stats() -> dict:
+    """Return disk usage for the working directory, cached for a short TTL."""
+    now = time.monotonic()
+    if _disk_stats_cache["value"] is not None and now < _disk_stats_cache["expires_at"]:
+        return _disk_stats_cache["value"]
+    
+    st = os.statvfs(os.getcwd())
+    total = st.f_blocks * st.f_frsize
+    free = st.f_bfree * st.f_frsize
+    usage_percent = (total - free) / total * 100 if total else 0.0
+    
+    stats = {
+        "usage_percent": round(usage_percent, 2),
+        "free_mb": round(free / (1024 * 1024), 2),
+    }
+    _disk_stats_cache["value"] = stats
+    _disk_stats_cache["expires_at"] = now + DISK_STATS_TTL_SECONDS
+    return stats
+
+
+# Upper bound for a single component probe so a stuck backend can't hang /health
+HEALTH_CHECK_TIMEOUT_SECONDS = 2.0
+
+# A Redis command that succeeded this recently stands in for an explicit ping
+REDIS_RECENT_SUCCESS_SECONDS = 10.0
+
+# Assembled /health responses are reused for a short window to absorb probe storms
+HEALTH_CACHE_TTL_SECONDS = 1.5
+_health_cache = {"expires_at": 0.0, "value": None}
+_health_cache_lock = asyncio.Lock()
+
+
+async def _check_database() -> dict:
+    """Run a trivial query against the database and report its latency."""
+    start_time = time.perf_counter()
+    if not await database_probe.check():
+        return {"status": "unhealthy", "error": "Unexpected result from database"}
+    return {
+        "status": "healthy",
+        "latency_ms": round((time.perf_counter() - start_time) * 1000, 2)
+    }
+
+
+async def _check_redis() -> dict:
+    """Ping Redis and report its latency.
+    
+    The ping is skipped when application traffic has already shown Redis
+    to be reachable within the last REDIS_RECENT_SUCCESS_SECONDS.
+    """
+    if redis_manager.seconds_since_last_success() < REDIS_RECENT_SUCCESS_SECONDS:
+        return {"status": "healthy", "latency_ms": 0}
+    
+    start_time = time.perf_counter()
+    result = await redis_manager.ping()
+    if not result:
+        return {"status": "unhealthy", "error": "Redis ping failed"}
+    return {
+        "status": "healthy",
+        "latency_ms": round((time.perf_counter() - start_time) * 1000, 2)
+    }
+
 
 @router.get(
     "/health",
@@ -21,8 +85,33 @@ router = APIRouter(tags=["health"])
     summary="Get system health status",
     response_description="Health status of all system components"
 )
-async def health_check(db: AsyncSession = Depends(get_db)):
+async def health_check():
     """Check health of all system components."""
+    cached = _get_cached_health_status()
+    if cached is not None:
+        return cached
+    
+    # Concurrent probes wait for a single refresh instead of each hitting the backends
+    async with _health_cache_lock:
+        cached = _get_cached_health_status()
+        if cached is not None:
+            return cached
+        
+        health_status = await _build_health_status()
+        _health_cache["value"] = health_status
+        _health_cache["expires_at"] = time.monotonic() + HEALTH_CACHE_TTL_SECONDS
+        return health_status
+
+
+def _get_cached_health_status():
+    """Return the cached health status if it is still fresh, otherwise None."""
+    if time.monotonic() < _health_cache["expires_at"]:
+        return _health_cache["value"]
+    return None
+
+
+async def _build_health_status() -> dict:
+    """Probe every component and assemble the health status payload."""
     health_status = {
         "status": "healthy",
         "version": settings.APP_VERSION,
@@ -31,58 +120,32 @@ async def health_check(db: AsyncSession = Depends(get_db)):
         "components": {}
     }
     
-    # Check database connection
-    try:
-        # Simple query to verify DB connection
-        result = await db.execute(text("SELECT 1"))
-        await db.commit()
-        if result.scalar_one() == 1:
-            health_status["components"]["database"] = {
-                "status": "healthy",
-                "latency_ms": 0  # We'll calculate this below
-            }
-    except Exception as e:
-        health_status["status"] = "degraded"
-        health_status["components"]["database"] = {
-            "status": "unhealthy",
-            "error": str(e)
-        }
-    
-    # Check Redis connection if enabled
+    # Probe the database and Redis (if enabled) concurrently
+    checks = {"database": _check_database()}
     if redis_manager.is_enabled:
-        try:
-            # Measure Redis ping latency
-            start_time = time.time()
-            result = await redis_manager.ping()
-            end_time = time.time()
-            
-            if result:
-                latency = round((end_time - start_time) * 1000, 2)
-                health_status["components"]["redis"] = {
-                    "status": "healthy",
-                    "latency_ms": latency
-                }
-            else:
-                health_status["status"] = "degraded"
-                health_status["components"]["redis"] = {
-                    "status": "unhealthy",
-                    "error": "Redis ping failed"
-                }
-        except Exception as e:
+        checks["redis"] = _check_redis()
+    
+    results = await asyncio.gather(
+        *(asyncio.wait_for(check, timeout=HEALTH_CHECK_TIMEOUT_SECONDS) for check in checks.values()),
+        return_exceptions=True
+    )
+    
+    for name, result in zip(checks, results):
+        if isinstance(result, asyncio.TimeoutError):
+            result = {"status": "unhealthy", "error": f"Timed out after {HEALTH_CHECK_TIMEOUT_SECONDS}s"}
+        elif isinstance(result, Exception):
+            result = {"status": "unhealthy", "error": str(result)}
+        if result["status"] != "healthy":
             health_status["status"] = "degraded"
-            health_status["components"]["redis"] = {
-                "status": "unhealthy",
-                "error": str(e)
-            }
+        health_status["components"][name] = result
     
     # Check disk space
     try:
-        total, used, free = os.statvfs(os.getcwd()).f_frsize, os.statvfs(os.getcwd()).f_blocks, os.statvfs(os.getcwd()).f_bfree
-        disk_usage_percent = (used - free) / used * 100
+        disk_stats = _get_disk_stats()
+        disk_usage_percent = disk_stats["usage_percent"]
         health_status["components"]["disk"] = {
             "status": "healthy" if disk_usage_percent < 90 else "warning",
-            "usage_percent": round(disk_usage_percent, 2),
-            "free_mb": round(free * os.statvfs(os.getcwd()).f_frsize / (1024 * 1024), 2)
+            **disk_stats
         }
         if disk_usage_percent > 90:
             health_status["status"] = "degraded"
@@ -90,7 +153,6 @@ async def health_check(db: AsyncSession = Depends(get_db)):
         # Ignore disk space errors
         pass
     
-    # Return appropriate status code based on overall health
     return health_status
 
 
@@ -100,16 +162,16 @@ async def health_check(db: AsyncSession = Depends(get_db)):
     summary="Readiness probe",
     response_description="Application readiness status"
 )
-async def readiness_probe(db: AsyncSession = Depends(get_db)):
+async def readiness_probe():
     """Check if application is ready to handle requests."""
     # Check critical components needed for the application to function
     components_status = {"api": True, "database": False}
     
     # Check database
     try:
-        result = await db.execute(text("SELECT 1"))
-        await db.commit()
-        components_status["database"] = result.scalar_one() == 1
+        components_status["database"] = await asyncio.wait_for(
+            database_probe.check(), timeout=HEALTH_CHECK_TIMEOUT_SECONDS
+        )
     except Exception:
         components_status["database"] = False
     
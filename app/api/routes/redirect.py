@@ -1,47 +1,40 @@
 """URL redirection endpoint with click tracking."""
 
-from fastapi import APIRouter, Depends, HTTPException, Request, BackgroundTasks, status
+from datetime import datetime
+from typing import AsyncContextManager, Callable, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from starlette.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from loguru import logger
 
-from app.api.dependencies import get_shortener_service, get_stats_service
-from app.db.session import get_db, db_transaction, SessionManager
+from app.api.dependencies import get_shortener_service
+from app.core.config import settings
+from app.core.telemetry import METRICS
+from app.db.session import get_db_session_factory
 from app.services.shortener import ShortenedURLService
-from app.services.stats import StatsService
+from app.services.click_buffer import click_buffer
 from app.services.exceptions import URLNotFoundError, URLExpiredError
-from app.core.decorators import log_url_access_decorator
+from app.core.url_logger import log_url_access
 
 # Create router with tags
 router = APIRouter(tags=["redirect"])
 
+# Metric attributes for redirects served from the cache and from the database
+_CACHE_HIT_ATTRS = {"cache": "hit"}
+_CACHE_MISS_ATTRS = {"cache": "miss"}
+
+# Cached redirects never reach us, so shared caching is opt-in
+_CACHE_SCOPE = "public" if settings.REDIRECT_CACHE_PUBLIC else "private"
 
-async def track_click(
-    stats_service: StatsService,
-    short_code: str,
-    ip_address: str = None,
-    user_agent: str = None
-):
-    """Track click events in a separate database session.
-    
-    Args:
-        stats_service: Statistics service instance
-        short_code: Short code that was clicked
-        ip_address: Client IP address
-        user_agent: Client user agent string
-    """
-    # Create a new database session for the background task
-    async with SessionManager.transaction_context() as db:
-        try:
-            await stats_service.track_click(
-                db=db,
-                short_code=short_code,
-                ip_address=ip_address,
-                user_agent=user_agent
-            )
-        except Exception as e:
-            # Log but don't fail the request
-            logger.error(f"Error tracking click", short_code=short_code, error=str(e))
+
+def _cache_control(expires_at: Optional[datetime]) -> str:
+    """Build the Cache-Control header for a redirect, bounded by URL expiry."""
+    max_age = settings.REDIRECT_CACHE_MAX_AGE
+    if expires_at is not None:
+        max_age = min(max_age, int((expires_at - datetime.utcnow()).total_seconds()))
+    if max_age <= 0:
+        return "no-store"
+    return f"{_CACHE_SCOPE}, max-age={max_age}"
 
 
 @router.get(
@@ -49,39 +42,45 @@ async def track_click(
     response_class=RedirectResponse,
     status_code=status.HTTP_307_TEMPORARY_REDIRECT
 )
-@db_transaction()
-@log_url_access_decorator()
 async def redirect_to_original_url(
     request: Request,
-    background_tasks: BackgroundTasks,
     short_code: str,
-    db: AsyncSession = Depends(get_db),
-    shortener_service: ShortenedURLService = Depends(get_shortener_service),
-    stats_service: StatsService = Depends(get_stats_service)
+    db_factory: Callable[[], AsyncContextManager[AsyncSession]] = Depends(get_db_session_factory),
+    shortener_service: ShortenedURLService = Depends(get_shortener_service)
 ):
-    """Redirect to original URL and track click as background task."""
+    """Redirect to original URL and queue the click for batched tracking."""
+    # Extract tracking information from request
+    ip_address = request.client.host if request.client else None
+    user_agent = request.headers.get("user-agent")
+    
+    # Log every access attempt, including unknown and expired codes
+    log_url_access(short_code, ip_address or "unknown", user_agent or "")
+    
     try:
-        # Get the URL
-        url = await shortener_service.get_url_by_code(db, short_code)
+        # Serve from the Redis cache, falling back to the database on a miss
+        cached = await shortener_service.get_cached_redirect(short_code)
+        if cached is not None:
+            original_url, expires_at = cached
+            metric_attrs = _CACHE_HIT_ATTRS
+        else:
+            # Only cache misses open a database session
+            async with db_factory() as db:
+                url = await shortener_service.get_url_by_code(db, short_code)
+            await shortener_service.cache_url(url)
+            original_url, expires_at = url.original_url, url.expires_at
+            metric_attrs = _CACHE_MISS_ATTRS
         
-        # Extract tracking information from request
-        ip_address = request.client.host if request.client else None
-        user_agent = request.headers.get("user-agent")
+        # Queue the click; it is persisted in batches outside the request
+        click_buffer.add(short_code, ip_address, user_agent)
+        if METRICS.redirect_counter is not None:
+            METRICS.redirect_counter.add(1, metric_attrs)
         
-        # URL access logging is now handled by the decorator
-        
-        # Add click tracking as a background task - don't pass the db session
-        background_tasks.add_task(
-            track_click,
-            stats_service,
-            short_code,
-            ip_address,
-            user_agent
+        # Return redirect to original URL; caches may reuse it until max-age
+        return RedirectResponse(
+            url=original_url,
+            headers={"Cache-Control": _cache_control(expires_at)}
         )
         
-        # Return redirect to original URL
-        return RedirectResponse(url=url.original_url)
-        
     except URLNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except URLExpiredError as e:
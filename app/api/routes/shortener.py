@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, Path, Query, BackgroundTasks, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import schemas
 from app.db.session import get_db, db_transaction
-from app.api.dependencies import get_shortener_service, get_stats_service, get_base_url
+from app.api.dependencies import get_shortener_service, get_stats_service
+from app.core.config import settings
+from app.core.telemetry import METRICS
 from app.services.shortener import ShortenedURLService
 from app.services.stats import StatsService
 from app.services.exceptions import (
@@ -15,10 +18,39 @@ from app.services.exceptions import (
 )
 from typing import Optional
 from datetime import datetime
-from app.api.params import LimitParam, SkipParam
+from app.api.params import Limit, Skip, IncludeExpired
 
 router = APIRouter(tags=["shortener"])
 
+# BASE_URL never changes at runtime, so it is bound once instead of being
+# resolved as a dependency on every request
+_SHORT_URL_PREFIX = settings.BASE_URL + "/"
+
+
+def _to_list_response(urls) -> ORJSONResponse:
+    """Serialize ORM rows into the list response shared by the listing endpoints.
+    
+    Rows come from the ORM already typed, so plain dicts are handed straight to
+    orjson instead of going through per-item model validation and encoding.
+    """
+    prefix = _SHORT_URL_PREFIX
+    url_responses = [
+        {
+            "short_code": url.short_code,
+            "original_url": url.original_url,
+            "short_url": prefix + url.short_code,
+            "created_at": url.created_at,
+            "expires_at": url.expires_at,
+            "is_custom": url.is_custom,
+            "click_count": url.click_count
+        }
+        for url in urls
+    ]
+    return ORJSONResponse({
+        "urls": url_responses,
+        "page_count": len(url_responses)
+    })
+
 
 @router.post(
     "/shorten",
@@ -33,8 +65,7 @@ router = APIRouter(tags=["shortener"])
 async def create_short_url(
     url_data: schemas.URLCreateRequest,
     db: AsyncSession = Depends(get_db),
-    shortener_service: ShortenedURLService = Depends(get_shortener_service),
-    base_url: str = Depends(get_base_url)
+    shortener_service: ShortenedURLService = Depends(get_shortener_service)
 ):
     try:
         url = await shortener_service.create_short_url(
@@ -43,7 +74,9 @@ async def create_short_url(
             custom_code=url_data.custom_code,
             expiration_days=url_data.expiration_days
         )
-        short_url = f"{base_url}/{url.short_code}"
+        if METRICS.url_counter is not None:
+            METRICS.url_counter.add(1, {"custom": url.is_custom})
+        short_url = _SHORT_URL_PREFIX + url.short_code
         return schemas.URLResponse(
             short_code=url.short_code,
             original_url=url.original_url,
@@ -65,16 +98,16 @@ async def create_short_url(
 
 @router.get(
     "/urls",
-    response_model=schemas.URLListResponse
+    response_model=schemas.URLListResponse,
+    response_class=ORJSONResponse
 )
 @db_transaction()
 async def list_urls(
-    skip: int = SkipParam(),
-    limit: int = LimitParam(),
-    include_expired: bool = Query(False, description="Include expired URLs"),
+    skip: Skip = 0,
+    limit: Limit = 20,
+    include_expired: IncludeExpired = False,
     db: AsyncSession = Depends(get_db),
-    shortener_service: ShortenedURLService = Depends(get_shortener_service),
-    base_url: str = Depends(get_base_url)
+    shortener_service: ShortenedURLService = Depends(get_shortener_service)
 ):
     urls = await shortener_service.get_urls_list(
         db=db,
@@ -82,37 +115,22 @@ async def list_urls(
         limit=limit,
         include_expired=include_expired
     )
-    url_responses = []
-    for url in urls:
-        short_url = f"{base_url}/{url.short_code}"
-        url_responses.append(schemas.URLResponse(
-            short_code=url.short_code,
-            original_url=url.original_url,
-            short_url=short_url,
-            created_at=url.created_at,
-            expires_at=url.expires_at,
-            is_custom=url.is_custom,
-            click_count=url.click_count
-        ))
-    return schemas.URLListResponse(
-        urls=url_responses,
-        page_count=len(url_responses)
-    )
+    return _to_list_response(urls)
 
 
 @router.get(
     "/urls/paginated",
-    response_model=schemas.URLListResponse
+    response_model=schemas.URLListResponse,
+    response_class=ORJSONResponse
 )
 @db_transaction()
 async def list_urls_keyset(
-    limit: int = LimitParam(),
+    limit: Limit = 20,
     last_created_at: Optional[datetime] = Query(None, description="Timestamp of the last URL from previous page"),
     last_id: Optional[int] = Query(None, description="ID of the last URL from previous page"),
-    include_expired: bool = Query(False, description="Include expired URLs"),
+    include_expired: IncludeExpired = False,
     db: AsyncSession = Depends(get_db),
-    shortener_service: ShortenedURLService = Depends(get_shortener_service),
-    base_url: str = Depends(get_base_url)
+    shortener_service: ShortenedURLService = Depends(get_shortener_service)
 ):
     """
     Get paginated list of URLs using efficient keyset pagination.
@@ -127,37 +145,22 @@ async def list_urls_keyset(
         last_id=last_id,
         include_expired=include_expired
     )
-    url_responses = []
-    for url in urls:
-        short_url = f"{base_url}/{url.short_code}"
-        url_responses.append(schemas.URLResponse(
-            short_code=url.short_code,
-            original_url=url.original_url,
-            short_url=short_url,
-            created_at=url.created_at,
-            expires_at=url.expires_at,
-            is_custom=url.is_custom,
-            click_count=url.click_count
-        ))
-    return schemas.URLListResponse(
-        urls=url_responses,
-        page_count=len(url_responses)
-    )
+    return _to_list_response(urls)
 
 
 @router.get(
     "/urls/top/paginated",
-    response_model=schemas.URLListResponse
+    response_model=schemas.URLListResponse,
+    response_class=ORJSONResponse
 )
 @db_transaction()
 async def list_top_urls_keyset(
-    limit: int = LimitParam(10),
+    limit: Limit = 10,
     last_click_count: Optional[int] = Query(None, description="Click count of the last URL from previous page"),
     last_id: Optional[int] = Query(None, description="ID of the last URL from previous page"),
-    include_expired: bool = Query(False, description="Include expired URLs"),
+    include_expired: IncludeExpired = False,
     db: AsyncSession = Depends(get_db),
-    shortener_service: ShortenedURLService = Depends(get_shortener_service),
-    base_url: str = Depends(get_base_url)
+    shortener_service: ShortenedURLService = Depends(get_shortener_service)
 ):
     """
     Get top URLs by click count using efficient keyset pagination.
@@ -172,22 +175,7 @@ async def list_top_urls_keyset(
         last_id=last_id,
         include_expired=include_expired
     )
-    url_responses = []
-    for url in urls:
-        short_url = f"{base_url}/{url.short_code}"
-        url_responses.append(schemas.URLResponse(
-            short_code=url.short_code,
-            original_url=url.original_url,
-            short_url=short_url,
-            created_at=url.created_at,
-            expires_at=url.expires_at,
-            is_custom=url.is_custom,
-            click_count=url.click_count
-        ))
-    return schemas.URLListResponse(
-        urls=url_responses,
-        page_count=len(url_responses)
-    )
+    return _to_list_response(urls)
 
 
 @router.get(
@@ -202,12 +190,11 @@ async def list_top_urls_keyset(
 async def get_url_info(
     short_code: str = Path(..., description="The short code of the URL"),
     db: AsyncSession = Depends(get_db),
-    shortener_service: ShortenedURLService = Depends(get_shortener_service),
-    base_url: str = Depends(get_base_url)
+    shortener_service: ShortenedURLService = Depends(get_shortener_service)
 ):
     try:
         url_info = await shortener_service.get_url_info(db, short_code)
-        short_url = f"{base_url}/{short_code}"
+        short_url = _SHORT_URL_PREFIX + short_code
         return schemas.URLResponse(
             short_code=url_info["short_code"],
             original_url=url_info["original_url"],
@@ -1,6 +1,20 @@
 """Core module for the URL shortener application."""
 
-from app.core.config import settings
-from app.core import alembic
+from typing import Any
 
 __all__ = ["settings", "alembic"]
+
+
+def __getattr__(name: str) -> Any:
+    """Load settings and migration helpers on first access.
+    
+    Importing a submodule such as app.core.config goes through this package,
+    so eager imports here would build the settings for every importer.
+    """
+    if name == "settings":
+        from app.core.config import settings
+        return settings
+    if name == "alembic":
+        from app.core import alembic
+        return alembic
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
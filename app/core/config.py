@@ -6,14 +6,16 @@ loaded from environment variables with appropriate defaults.
 
 from __future__ import annotations
 
+import ipaddress
 import os
 import string
-from typing import Optional, Dict, Any, List, Union
+from functools import cached_property, lru_cache
+from typing import Optional, Any, FrozenSet, List, Tuple, Union
 from enum import Enum
 from pathlib import Path
 import logging
 
-from pydantic import Field, field_validator, computed_field, ValidationInfo
+from pydantic import Field, computed_field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # Set up basic logger for config module
@@ -23,6 +25,19 @@ logger = logging.getLogger(__name__)
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
 
+@lru_cache(maxsize=32)
+def _parse_list_or_string(v: str) -> Tuple[str, ...]:
+    """Split a comma-separated setting into its stripped items."""
+    # If it's an empty string, return no items
+    if not v.strip():
+        return ()
+    # If it's a single "*", keep it as one item
+    if v == "*":
+        return ("*",)
+    # Otherwise split by comma and strip whitespace
+    return tuple(item.strip() for item in v.split(","))
+
+
 class EnvironmentType(str, Enum):
     DEVELOPMENT = "development"
     STAGING = "staging"
@@ -41,7 +56,8 @@ class Settings(BaseSettings):
         env_file=".env",
         env_file_encoding="utf-8",
         case_sensitive=False,
-        extra="ignore"
+        extra="ignore",
+        frozen=True  # Read-only singleton; cached computed fields rely on this
     )
     
     # Environment setting
@@ -58,7 +74,7 @@ class Settings(BaseSettings):
     DEBUG: bool = False
     
     # CORS settings
-    CORS_ORIGINS: Union[List[str], str] = ["*"]  # Allow all origins by default
+    CORS_ORIGINS: str = "*"  # Comma-separated; allow all origins by default
     
     # URL Shortening Configuration
     URL_CODE_LENGTH: int = 6  # Default length for short codes
@@ -83,6 +99,8 @@ class Settings(BaseSettings):
     POSTGRES_POOL_MAX_OVERFLOW: int = 10
     POSTGRES_POOL_TIMEOUT: int = 30
     POSTGRES_POOL_RECYCLE: int = 300
+    POSTGRES_POOL_PRE_PING: bool = True  # Ping on checkout in production so dropped connections are replaced, not handed to requests
+    POSTGRES_PROBE_POOL_SIZE: int = 2  # Fallback probe pool, used only for drivers other than asyncpg
     DB_ECHO: bool = False
     
     # Database connection resilience settings
@@ -102,38 +120,26 @@ class Settings(BaseSettings):
     REDIS_PORT: int = int(os.getenv("REDIS_PORT", "6379"))
     REDIS_PASSWORD: str = os.getenv("REDIS_PASSWORD", "")
     REDIS_DB: int = int(os.getenv("REDIS_DB", "0"))
+    REDIS_POOL_MAX: int = 20  # Max connections per pool; extra commands wait for a free one
+    REDIS_POOL_TIMEOUT: float = 5.0  # Seconds to wait for a pooled connection before erroring
     
     # Cache settings
     CACHE_TIMEOUT: int = 3600
     CACHE_ENABLED: bool = True
+    REDIRECT_CACHE_MAX_AGE: int = 0  # Cache-Control max-age for redirects (0 sends no-store; cached hits skip click tracking)
+    REDIRECT_CACHE_PUBLIC: bool = False  # Let CDNs and shared proxies cache redirects, not just the browser
     
     # Rate limiting
     RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_DEFAULT: int = 1  # Default requests per minute
     RATE_LIMIT_STRATEGY: str = "moving-window"
-    RATE_LIMIT_ADMIN_IPS: Union[List[str], str] = []  # IPs that bypass rate limits
-    RATE_LIMIT_ADMIN_API_KEYS: Union[List[str], str] = []  # API keys that bypass rate limits
+    RATE_LIMIT_ADMIN_IPS: str = ""  # Comma-separated IPs or CIDR ranges that bypass rate limits, matched against the connecting peer only
+    RATE_LIMIT_ADMIN_API_KEYS: str = ""  # Comma-separated API keys that bypass rate limits
     
     # Rate limiting backend resilience configuration
     RATE_LIMIT_REDIS_CHECK_INTERVAL: int = 10  # Seconds between Redis health checks
     RATE_LIMIT_REDIS_MAX_ERRORS: int = 3  # Max Redis errors before switching to memory backend
-    
-    # Advanced rate limiting configuration
-    # This can be overridden with environment variables
-    RATE_LIMIT_CONFIG: Dict[str, List[Dict[str, Any]]] = {
-        r"^/api/": [
-            {"second": 30, "group": "default"},  # Strict 1 req/sec for most APIs
-            {"group": "admin"},  # No limit for admin group
-        ],
-        r"^/api/shorten": [
-            {"second": 30, "group": "default"},  # Strict 1 req/sec for shortening
-            {"group": "admin"},
-        ],
-        r"^/api/urls": [
-            {"second": 30, "group": "default"},  # Strict 1 req/sec for URL info
-            {"group": "admin"},
-        ],
-    }
+    RATE_LIMIT_LOCAL_BLOCK_TTL: float = 0.2  # Seconds a block is answered locally before asking the backend again
     
     # Security
     SECRET_KEY: str = "change_this_to_a_secure_random_string_in_production"
@@ -149,6 +155,13 @@ class Settings(BaseSettings):
     LOG_JSON: bool = True
     REQUEST_LOGGING_ENABLED: bool = True  # Enable request logging middleware
     
+    # URL access log configuration
+    URL_ACCESS_LOG_BUFFER_SIZE: int = 100000  # Records held in memory before the oldest are dropped
+    URL_ACCESS_LOG_BATCH_SIZE: int = 4096  # Records written per file write
+    URL_ACCESS_LOG_FLUSH_INTERVAL: float = 1.0  # seconds
+    URL_ACCESS_LOG_MAX_BYTES: int = 10 * 1024 * 1024  # Rotate the file once it reaches this size
+    URL_ACCESS_LOG_BACKUP_COUNT: int = 5  # Rotated files kept
+    
     # Redis logging configuration
     REDIS_LOGGING_ENABLED: bool = True
     REDIS_LOGGING_QUEUE: str = "app:logs"
@@ -159,6 +172,19 @@ class Settings(BaseSettings):
     REDIS_LOGGING_MAX_RETRIES: int = 3
     REDIS_LOGGING_FALLBACK_LOCAL: bool = True
     
+    # Click tracking buffer configuration
+    CLICK_BUFFER_BATCH_SIZE: int = 500  # Max clicks written per transaction
+    CLICK_BUFFER_FLUSH_INTERVAL: float = 1.0  # seconds
+    CLICK_BUFFER_MAX_SIZE: int = 10000  # Clicks queued before new ones are dropped
+    CLICK_COUNTER_REDIS_ENABLED: bool = True  # Accumulate click_count in Redis between syncs
+    CLICK_COUNTER_REDIS_KEY: str = "clicks:pending"  # Redis hash of url_id -> pending clicks
+    CLICK_COUNT_SYNC_INTERVAL_SECONDS: int = 30  # How often Redis counts are written to the database
+    CLICK_STREAM_ENABLED: bool = True  # Publish click batches to a Redis stream read by a consumer group
+    CLICK_STREAM_KEY: str = "clicks"
+    CLICK_STREAM_GROUP: str = "click-writers"
+    CLICK_STREAM_MAXLEN: int = 100000  # Approximate stream length kept in Redis
+    CLICK_STREAM_CLAIM_IDLE_SECONDS: float = 60.0  # Unacknowledged entries older than this are claimed from other consumers
+    
     # Metrics configuration
     METRICS_ENABLED: bool = True
     
@@ -186,55 +212,86 @@ class Settings(BaseSettings):
     OTEL_PYTHON_LOG_CORRELATION: bool = True  # Enable log correlation
     OTEL_PYTHON_LOG_LEVEL: str = "INFO"  # Log level for OpenTelemetry
     OTEL_METRICS_EXPORT_INTERVAL_MILLIS: int = 60000  # Export metrics every 60 seconds
+    OTEL_METRICS_EXPORT_TIMEOUT_MILLIS: int = 30000  # Timeout for a metrics export
+    OTEL_BSP_MAX_QUEUE_SIZE: int = 8192  # Spans buffered before new ones are dropped
+    OTEL_BSP_MAX_EXPORT_BATCH_SIZE: int = 1024  # Spans sent per export
+    OTEL_BSP_SCHEDULE_DELAY_MILLIS: int = 5000  # Max delay between span exports
+    OTEL_BSP_EXPORT_TIMEOUT_MILLIS: int = 30000  # Timeout for a span export
     OTEL_EXPORTER_OTLP_PROTOCOL: str = "grpc"  # Protocol to use for OTLP export (grpc or http/protobuf)
     
     # Validators
-    @field_validator("DEFAULT_EXPIRATION_DAYS", mode="before")
-    def validate_expiration_days(cls, v: Any) -> Optional[int]:
-        """Convert empty string to None for DEFAULT_EXPIRATION_DAYS."""
-        if v == "":
-            return None
-        if v is None:
-            return None
-        try:
-            return int(v)
-        except (ValueError, TypeError):
-            return None
-    
-    @field_validator("SECRET_KEY")
-    def validate_secret_key(cls, v: str, info: ValidationInfo) -> str:
-        default_value = "change_this_to_a_secure_random_string_in_production"
-        # Get the environment value from the data dictionary instead of using cls.ENVIRONMENT
-        env_value = info.data.get('ENVIRONMENT', EnvironmentType.DEVELOPMENT)
+    @model_validator(mode="before")
+    @classmethod
+    def normalize_inputs(cls, values: Any) -> Any:
+        """Normalize raw inputs in a single pass before field validation.
+        
+        Converts an empty or invalid DEFAULT_EXPIRATION_DAYS to None and warns
+        when production runs with the default SECRET_KEY.
+        """
+        if not isinstance(values, dict):
+            return values
+        
+        expiration_days = values.get("DEFAULT_EXPIRATION_DAYS")
+        if expiration_days is not None:
+            try:
+                values["DEFAULT_EXPIRATION_DAYS"] = int(expiration_days) if expiration_days != "" else None
+            except (ValueError, TypeError):
+                values["DEFAULT_EXPIRATION_DAYS"] = None
         
         # Check if the environment is production and we're using the default key
-        if v == default_value and (env_value == EnvironmentType.PRODUCTION or str(env_value) == "production"):
+        default_secret = "change_this_to_a_secure_random_string_in_production"
+        env_value = values.get("ENVIRONMENT", EnvironmentType.DEVELOPMENT)
+        is_production = str(getattr(env_value, "value", env_value)).lower() == "production"
+        if is_production and values.get("SECRET_KEY", default_secret) == default_secret:
             # Only warn during validation, don't block startup
             # In a real production app, you might want to raise an error here
             logger.warning("Using default SECRET_KEY in production environment! This is a security risk.")
-        return v
-    
-    @field_validator("CORS_ORIGINS", "RATE_LIMIT_ADMIN_IPS", "RATE_LIMIT_ADMIN_API_KEYS")
-    def validate_list_or_string(cls, v: Union[List[str], str]) -> List[str]:
-        """Convert comma-separated string to list if needed."""
-        if isinstance(v, str):
-            # If it's an empty string, return an empty list
-            if not v.strip():
-                return []
-            # If it's a single "*", keep it as a list with one element
-            if v == "*":
-                return ["*"]
-            # Otherwise split by comma and strip whitespace
-            return [item.strip() for item in v.split(",")]
-        return v
-    
-    # Computed fields
+        return values
+    
+    @cached_property
+    def ADMIN_IP_SET(self) -> FrozenSet[str]:
+        """Exact addresses from RATE_LIMIT_ADMIN_IPS, for O(1) membership checks."""
+        return frozenset(ip for ip in self.RATE_LIMIT_ADMIN_IPS_LIST if "/" not in ip)
+    
+    @cached_property
+    def ADMIN_IP_NETWORKS(self) -> Tuple[Union[ipaddress.IPv4Network, ipaddress.IPv6Network], ...]:
+        """CIDR ranges from RATE_LIMIT_ADMIN_IPS."""
+        networks = []
+        for entry in self.RATE_LIMIT_ADMIN_IPS_LIST:
+            if "/" not in entry:
+                continue
+            try:
+                networks.append(ipaddress.ip_network(entry, strict=False))
+            except ValueError:
+                logger.warning(f"Ignoring invalid admin network in RATE_LIMIT_ADMIN_IPS: {entry}")
+        return tuple(networks)
+    
+    def is_admin_ip(self, ip: str) -> bool:
+        """
+        Check whether a client address bypasses rate limits.
+        
+        Exact addresses are checked first; CIDR ranges are only walked on a miss.
+        """
+        if ip in self.ADMIN_IP_SET:
+            return True
+        networks = self.ADMIN_IP_NETWORKS
+        if not networks:
+            return False
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return False
+        return any(address in network for network in networks)
+    
+    # Computed fields, built once per instance since settings are not changed at runtime
     @computed_field
+    @cached_property
     def PG_DSN(self) -> str:
         """Construct the PostgreSQL DSN from individual components."""
         return f"postgresql+psycopg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
     
     @computed_field
+    @cached_property
     def SQLALCHEMY_DATABASE_URI(self) -> str:
         """Construct the SQLAlchemy database URI from settings or use override."""
         # Check if there's an explicit override in environment variables
@@ -245,6 +302,31 @@ class Settings(BaseSettings):
         return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
     
     @computed_field
+    @cached_property
+    def CORS_ORIGINS_LIST(self) -> List[str]:
+        """CORS origins parsed from the comma-separated CORS_ORIGINS."""
+        return list(_parse_list_or_string(self.CORS_ORIGINS))
+    
+    @computed_field
+    @cached_property
+    def RATE_LIMIT_ADMIN_IPS_LIST(self) -> List[str]:
+        """Admin addresses parsed from the comma-separated RATE_LIMIT_ADMIN_IPS."""
+        return list(_parse_list_or_string(self.RATE_LIMIT_ADMIN_IPS))
+    
+    @computed_field
+    @cached_property
+    def RATE_LIMIT_ADMIN_API_KEYS_LIST(self) -> List[str]:
+        """Admin API keys parsed from the comma-separated RATE_LIMIT_ADMIN_API_KEYS."""
+        return list(_parse_list_or_string(self.RATE_LIMIT_ADMIN_API_KEYS))
+    
+    @computed_field
+    @cached_property
+    def LOG_FILE_PATH(self) -> Path:
+        """Path of the application log file."""
+        return Path(self.LOG_DIR) / self.LOG_FILENAME
+    
+    @computed_field
+    @cached_property
     def REDIS_URI(self) -> str:
         """Construct the Redis URI from settings or use override."""
         # Check if there's an explicit override in environment variables
@@ -256,5 +338,22 @@ class Settings(BaseSettings):
         return f"redis://{password_part}{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
 
 
-# Create a singleton instance of the settings
-settings = Settings() 
\ No newline at end of file
+def _get_settings() -> Settings:
+    """Get the settings singleton, creating it on first use."""
+    global settings
+    try:
+        return settings
+    except NameError:
+        settings = Settings()
+        return settings
+
+
+def __getattr__(name: str) -> Any:
+    """Create the settings singleton lazily (PEP 562).
+    
+    Importers that only need module constants such as BASE_DIR never read
+    the environment, the .env file or run the validators.
+    """
+    if name == "settings":
+        return _get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}") 
\ No newline at end of file
@@ -4,16 +4,26 @@ Core logging module.
 This module configures the application logging with Loguru.
 """
 
-import json
 import logging
-import os
 import sys
-from typing import Any, Dict, Optional
+import traceback
+from typing import Any, Dict, Optional, Union
 
+import orjson
 from loguru import logger
 
 from app.core.config import settings
 
+# Source file of the stdlib logging module, skipped when looking for the caller
+_LOGGING_FILE = logging.__file__
+
+# Set once setup_logging has configured the sinks
+_setup_done = False
+
+# Stdlib level name -> Loguru level name (or number if Loguru has no such
+# level), filled as levels are seen
+_LEVEL_CACHE: Dict[str, Union[str, int]] = {}
+
 
 class InterceptHandler(logging.Handler):
     """
@@ -25,14 +35,18 @@ class InterceptHandler(logging.Handler):
 
     def emit(self, record: logging.LogRecord) -> None:
         # Try to get corresponding Loguru level or use level number
-        try:
-            level = logger.level(record.levelname).name
-        except ValueError:
-            level = record.levelno
+        level = _LEVEL_CACHE.get(record.levelname)
+        if level is None:
+            try:
+                level = logger.level(record.levelname).name
+            except ValueError:
+                level = record.levelno
+            _LEVEL_CACHE[record.levelname] = level
 
         # Find caller from where the logged message originated
+        logging_file = _LOGGING_FILE
         frame, depth = logging.currentframe(), 2
-        while frame and frame.f_code.co_filename == logging.__file__:
+        while frame is not None and frame.f_code.co_filename == logging_file:
             frame = frame.f_back
             depth += 1
 
@@ -41,19 +55,50 @@ class InterceptHandler(logging.Handler):
         )
 
 
+def _json_format(record: Dict[str, Any]) -> str:
+    """
+    Serialize a log record to one JSON line with orjson.
+    
+    Loguru treats the returned string as a format template, so the JSON is
+    stashed in the record's extra dict and referenced from the template.
+    """
+    payload = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "message": record["message"],
+        "name": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        "extra": record["extra"],
+    }
+    if record["exception"] is not None:
+        payload["exception"] = "".join(traceback.format_exception(*record["exception"]))
+    record["extra"]["_json"] = orjson.dumps(payload, default=str).decode("utf-8")
+    return "{extra[_json]}\n"
+
+
 def setup_logging() -> None:
     """
     Configure application logging using Loguru.
     
     This sets up Loguru with proper formatting, log levels, and handlers,
-    and also intercepts standard library logging.
+    and also intercepts standard library logging. Repeated calls return the
+    already configured logger.
     """
+    global _setup_done
+    if _setup_done:
+        return logger
+    
     # Create logs directory if it doesn't exist
-    os.makedirs(settings.LOG_DIR, exist_ok=True)
+    log_file_path = settings.LOG_FILE_PATH
+    log_file_path.parent.mkdir(parents=True, exist_ok=True)
     
     # Remove default handlers
     logger.remove()
     
+    # Sinks are enqueued so writes and file rotation happen on Loguru's
+    # background thread instead of the event loop
+    
     # Add stderr handler for development/debugging
     if settings.DEBUG:
         logger.add(
@@ -62,20 +107,21 @@ def setup_logging() -> None:
             format=settings.LOG_FORMAT,
             backtrace=True,
             diagnose=True,
+            enqueue=True,  # Write on Loguru's worker thread
         )
     
     # Add file handler with proper log rotation
-    log_file_path = os.path.join(settings.LOG_DIR, settings.LOG_FILENAME)
-    
     if settings.LOG_JSON:
-        # Use built-in serialization instead of custom formatter
+        # One compact JSON object per line, serialized with orjson
         logger.add(
             log_file_path,
             level=settings.LOG_LEVEL.upper(),
-            serialize=True,  # This enables JSON serialization
+            format=_json_format,
             rotation=settings.LOG_ROTATION,
             retention=settings.LOG_RETENTION,
             compression="gz",
+            enqueue=True,
+            catch=True,
         )
     else:
         # Text formatter
@@ -86,6 +132,8 @@ def setup_logging() -> None:
             rotation=settings.LOG_ROTATION,
             retention=settings.LOG_RETENTION,
             compression="gz",
+            enqueue=True,
+            catch=True,
         )
     
     # Register custom log level for request logs
@@ -94,14 +142,13 @@ def setup_logging() -> None:
     # Intercept standard library logging
     logging.basicConfig(handlers=[InterceptHandler()], level=0, force=True)
     
-    # Modify existing loggers to use InterceptHandler
-    for name in logging.root.manager.loggerDict.keys():
-        logging.getLogger(name).handlers = []
-        logging.getLogger(name).propagate = True
-    
-    # Set log levels for relevant libraries
+    # Other loggers reach the root handler through propagation. These ones
+    # get their own handlers from uvicorn's config, so they are replaced and
+    # kept from propagating to avoid logging each record twice.
     for log_name in ["uvicorn", "uvicorn.access", "uvicorn.error", "fastapi"]:
         logging_logger = logging.getLogger(log_name)
         logging_logger.handlers = [InterceptHandler()]
+        logging_logger.propagate = False
     
+    _setup_done = True
     return logger 
\ No newline at end of file
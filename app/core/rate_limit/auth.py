@@ -1,12 +1,68 @@
 """Authentication functions for rate limiting identification."""
 
-from typing import Tuple
+from functools import lru_cache, partial
+from typing import List, Optional, Tuple
 from ratelimit.types import Scope, Receive, Send, ASGIApp
-from fastapi.responses import JSONResponse
 import ipaddress
-import json
+import orjson
+import time
 from loguru import logger
 
+from app.core.config import settings
+
+_FORWARDED_FOR = b"x-forwarded-for"
+
+# Blocked requests arrive in bursts, so at most this many are logged per second
+_BLOCKED_LOG_LIMIT_PER_SECOND = 10
+_WARNING_LEVEL_NO = 30
+_blocked_log_window = 0.0
+_blocked_log_count = 0
+_blocked_log_suppressed = 0
+
+
+@lru_cache(maxsize=4096)
+def _parse_forwarded_ip(head: bytes) -> Optional[str]:
+    """Decode and validate an address from X-Forwarded-For.
+    
+    A handful of client addresses account for most traffic, so results are
+    memoized and repeat clients skip the ipaddress parse entirely.
+    
+    Args:
+        head: First address in the header, stripped of whitespace
+        
+    Returns:
+        The address as a string, or None if it is not a valid IP
+    """
+    try:
+        forwarded_for = head.decode("ascii")
+        ipaddress.ip_address(forwarded_for)
+        return forwarded_for
+    except ValueError:
+        # UnicodeDecodeError is a ValueError too
+        return None
+
+
+def _extract_client_ip(scope: Scope) -> str:
+    """Get the client IP from X-Forwarded-For, falling back to the peer address.
+    
+    Only the first address in the header is decoded and validated, so the rest
+    of the header is never split or copied.
+    
+    Args:
+        scope: ASGI connection scope
+        
+    Returns:
+        Client IP address, or "unknown" if none is available
+    """
+    for name, value in scope.get("headers", ()):
+        if name == _FORWARDED_FOR:
+            forwarded_for = _parse_forwarded_ip(value.partition(b",")[0].strip())
+            if forwarded_for is not None:
+                return forwarded_for
+    
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
 async def simple_auth(scope: Scope) -> Tuple[str, str]:
     """Identify users by IP address for rate limiting.
     
@@ -16,81 +72,105 @@ async def simple_auth(scope: Scope) -> Tuple[str, str]:
     Returns:
         Tuple of (user_id, group) where user_id is client IP
     """
-    # Extract client IP address
-    client_host = None
-    for header in scope.get("headers", []):
-        name, value = header
-        if name == b"x-forwarded-for":
-            # Get the first IP in X-Forwarded-For
-            forwarded_for = value.decode("latin1").split(",")[0].strip()
-            try:
-                # Validate IP address
-                ipaddress.ip_address(forwarded_for)
-                client_host = forwarded_for
-                break
-            except ValueError:
-                pass
-    
-    # If X-Forwarded-For header not found or invalid, use the client address
-    if client_host is None:
-        client_host = scope.get("client")[0] if scope.get("client") else "unknown"
-    
-    # Determine group based on path
+    client_host = _extract_client_ip(scope)
+    
+    # Admin addresses get the unlimited admin rules; otherwise group by path.
+    # X-Forwarded-For is client-controlled, so only the connecting peer counts.
     path = scope.get("path", "")
-    if path.startswith("/api/"):
+    peer = scope.get("client")
+    if peer and settings.is_admin_ip(peer[0]):
+        group = "admin"
+    elif path.startswith("/api/"):
         group = "api"
     else:
         group = "public"
         
     return client_host, group
 
+@lru_cache(maxsize=64)
+def _blocked_response(retry_after: int) -> Tuple[List[Tuple[bytes, bytes]], bytes]:
+    """Build the raw headers and body of a 429 response.
+    
+    retry_after only takes a few values set by the rule windows, so each
+    response is encoded once and reused for every request that gets blocked.
+    
+    Args:
+        retry_after: Time in seconds to wait before retrying
+        
+    Returns:
+        Tuple of (headers, body) ready to send over ASGI
+    """
+    body = orjson.dumps({
+        "error": "Too many requests",
+        "detail": f"Rate limit exceeded. Please try again in {retry_after} seconds.",
+        "retry_after": retry_after
+    })
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode("latin-1")),
+        (b"retry-after", str(retry_after).encode("latin-1")),
+    ]
+    return headers, body
+
+def _claim_blocked_log_slot() -> Optional[int]:
+    """Decide whether a blocked request should be logged.
+    
+    Returns:
+        Number of blocked requests skipped since the last logged one, or None
+        if this request should not be logged
+    """
+    global _blocked_log_window, _blocked_log_count, _blocked_log_suppressed
+    
+    # Skip building the log record at all when warnings are filtered out
+    if logger._core.min_level > _WARNING_LEVEL_NO:
+        return None
+    
+    now = time.monotonic()
+    if now - _blocked_log_window >= 1.0:
+        _blocked_log_window = now
+        _blocked_log_count = 0
+    
+    if _blocked_log_count >= _BLOCKED_LOG_LIMIT_PER_SECOND:
+        _blocked_log_suppressed += 1
+        return None
+    
+    _blocked_log_count += 1
+    suppressed = _blocked_log_suppressed
+    _blocked_log_suppressed = 0
+    return suppressed
+
+async def _blocked_handler(retry_after: int, scope: Scope, receive: Receive, send: Send) -> None:
+    """Log a rate limited request and send the cached 429 response."""
+    # Log the rate limit block with structured data, sampled under bursts
+    suppressed = _claim_blocked_log_slot()
+    if suppressed is not None:
+        logger.warning(
+            "Rate limit exceeded", 
+            ip=_extract_client_ip(scope), 
+            path=scope.get("path", ""), 
+            method=scope.get("method", ""), 
+            retry_after=retry_after,
+            suppressed=suppressed
+        )
+    
+    # Send the pre-encoded JSON response
+    headers, body = _blocked_response(retry_after)
+    await send({"type": "http.response.start", "status": 429, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+@lru_cache(maxsize=64)
 def custom_on_blocked(retry_after: int) -> ASGIApp:
     """
     Custom handler for blocked requests due to rate limiting.
     Returns a JSON response with an error message and retry-after information.
     
+    The handler is a partial over a module-level coroutine function, cached per
+    retry_after, so blocking a request allocates no new closure.
+    
     Args:
         retry_after: Time in seconds to wait before retrying
         
     Returns:
         ASGI application that handles blocked requests
     """
-    async def app_block_handler(scope: Scope, receive: Receive, send: Send) -> None:
-        # Extract client info for logging
-        client_ip = None
-        for header in scope.get("headers", []):
-            name, value = header
-            if name == b"x-forwarded-for":
-                client_ip = value.decode("latin1").split(",")[0].strip()
-                break
-                
-        if client_ip is None:
-            client_ip = scope.get("client")[0] if scope.get("client") else "unknown"
-            
-        path = scope.get("path", "")
-        method = scope.get("method", "")
-        
-        # Log the rate limit block with structured data
-        logger.warning(
-            "Rate limit exceeded", 
-            ip=client_ip, 
-            path=path, 
-            method=method, 
-            retry_after=retry_after
-        )
-        
-        # Prepare JSON response
-        response = JSONResponse(
-            status_code=429,
-            content={
-                "error": "Too many requests",
-                "detail": f"Rate limit exceeded. Please try again in {retry_after} seconds.",
-                "retry_after": retry_after
-            },
-            headers={"Retry-After": str(retry_after)}
-        )
-        
-        # Send HTTP response
-        await response(scope, receive, send)
-        
-    return app_block_handler 
\ No newline at end of file
+    return partial(_blocked_handler, retry_after)
@@ -2,10 +2,10 @@
 
 import asyncio
 import time
-from typing import Callable, Awaitable, Any
+from typing import Dict, Optional, Tuple
 
 from loguru import logger
-from redis.asyncio import StrictRedis
+from redis.asyncio import BlockingConnectionPool, StrictRedis
 from redis.exceptions import RedisError, ConnectionError
 from ratelimit.backends.base import BaseBackend
 from ratelimit.backends.simple import MemoryBackend
@@ -13,6 +13,11 @@ from ratelimit.backends.redis import RedisBackend
 
 from app.core.config import settings
 
+# Upper bound on locally remembered blocks before the cache is reset
+BLOCKED_CACHE_MAX_ENTRIES = 10000
+
+_INFO_LEVEL_NO = 20
+
 # Store the Redis client in a global variable for shutdown access
 redis_rate_limit_client = None
 
@@ -22,46 +27,84 @@ class ResilientRateLimitBackend(BaseBackend):
         self.redis_uri = redis_uri
         self.redis_client = None
         self.redis_backend = None
+        # Always present; requests fall back to it whenever Redis is unusable
         self.memory_backend = MemoryBackend()
-        self.using_redis = False
-        self.last_redis_check = 0
+        self._using_redis = False
+        # Name of the active backend for log records, kept in step with using_redis
+        self.backend_name = "memory"
         # Load configuration from settings instead of hardcoding
         self.redis_check_interval = settings.RATE_LIMIT_REDIS_CHECK_INTERVAL
         self.redis_errors = 0
         self.max_redis_errors = settings.RATE_LIMIT_REDIS_MAX_ERRORS
         # Lock only used for backend switching and state changes
         self._state_lock = asyncio.Lock()
+        # Background task that checks Redis and switches backends
+        self._health_task: Optional[asyncio.Task] = None
+        # (path, user, group) -> (monotonic time the local entry expires, retry_after)
+        self._blocked_until: Dict[Tuple[str, str, str], Tuple[float, int]] = {}
+        self.local_block_ttl = settings.RATE_LIMIT_LOCAL_BLOCK_TTL
+    
+    @property
+    def using_redis(self) -> bool:
+        return self._using_redis
+    
+    @using_redis.setter
+    def using_redis(self, value: bool) -> None:
+        self._using_redis = value
+        self.backend_name = "redis" if value else "memory"
         
     async def initialize(self):
         """Initialize Redis connection or fall back to memory.
         
+        Also starts the background health check that keeps switching between
+        Redis and memory backends off the request path.
+        
         Returns:
             bool: True if Redis connection successful
         """
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.create_task(self._health_loop())
+        
         # Acquire lock for state change
         async with self._state_lock:
+            return await self._connect()
+    
+    async def _connect(self):
+        """Connect to Redis, falling back to memory. Caller holds the state lock."""
+        try:
+            logger.info("Connecting to Redis rate limiting backend", uri=self.redis_uri)
+            pool = BlockingConnectionPool.from_url(
+                self.redis_uri,
+                max_connections=settings.REDIS_POOL_MAX,
+                timeout=settings.REDIS_POOL_TIMEOUT
+            )
+            self.redis_client = StrictRedis(connection_pool=pool)
+            # Test connection
+            await self.redis_client.ping()
+            self.redis_backend = RedisBackend(self.redis_client)
+            self.using_redis = True
+            self.redis_errors = 0
+            logger.info("Redis rate limiting backend initialized successfully")
+            # Set global client for shutdown
+            global redis_rate_limit_client
+            redis_rate_limit_client = self.redis_client
+            return True
+        except (RedisError, ConnectionError) as e:
+            logger.warning("Redis connection failed, using memory backend", error=str(e))
+            self.redis_client = None
+            self.redis_backend = None
+            self.using_redis = False
+            return False
+    
+    async def _health_loop(self):
+        """Check Redis health every redis_check_interval seconds until cancelled."""
+        while True:
+            await asyncio.sleep(self.redis_check_interval)
             try:
-                logger.info("Connecting to Redis rate limiting backend", uri=self.redis_uri)
-                self.redis_client = StrictRedis.from_url(self.redis_uri)
-                # Test connection
-                await self.redis_client.ping()
-                self.redis_backend = RedisBackend(self.redis_client)
-                self.using_redis = True
-                self.redis_errors = 0
-                logger.info("Redis rate limiting backend initialized successfully")
-                # Set global client for shutdown
-                global redis_rate_limit_client
-                redis_rate_limit_client = self.redis_client
-                return True
-            except (RedisError, ConnectionError) as e:
-                logger.warning("Redis connection failed, using memory backend", error=str(e))
-                self.redis_client = None
-                self.redis_backend = None
-                self.using_redis = False
-                # Ensure memory backend is initialized
-                if not hasattr(self, 'memory_backend') or self.memory_backend is None:
-                    self.memory_backend = MemoryBackend()
-                return False
+                await self.check_redis_health()
+            except Exception as e:
+                # Keep the loop alive; the next round will try again
+                logger.error("Rate limit Redis health check failed", error=str(e))
     
     async def check_redis_health(self):
         """Check Redis availability and switch backends if needed.
@@ -69,19 +112,8 @@ class ResilientRateLimitBackend(BaseBackend):
         Returns:
             bool: True if using Redis backend
         """
-        # Skip if we checked recently - no lock needed here as this is just a read of immutable data
-        current_time = asyncio.get_event_loop().time()
-        if current_time - self.last_redis_check < self.redis_check_interval:
-            return self.using_redis
-        
-        # Only acquire lock when we're actually going to check Redis health and potentially switch backends
         async with self._state_lock:
-            # Check again after acquiring lock in case another task already did the check
-            if current_time - self.last_redis_check < self.redis_check_interval:
-                return self.using_redis
-                
-            self.last_redis_check = current_time
-            logger.debug("Checking Redis health", current_status="using_redis" if self.using_redis else "using_memory")
+            logger.debug("Checking Redis health", current_status="using_" + self.backend_name)
             
             # If already using Redis, verify it's still available
             if self.using_redis and self.redis_client is not None:
@@ -96,89 +128,92 @@ class ResilientRateLimitBackend(BaseBackend):
                     
             # Already using memory, try to reconnect to Redis
             elif not self.using_redis:
-                try:
-                    # Try to reconnect
-                    logger.info("Attempting to reconnect to Redis")
-                    if self.redis_client is None:
-                        # Full initialization needed
-                        result = await self.initialize()
-                        if result:
-                            logger.info("Redis reconnected and backend initialized")
-                        return result
-                    else:
-                        # Just verify connection
-                        await self.redis_client.ping()
-                        # Create Redis backend if needed
-                        if self.redis_backend is None:
-                            self.redis_backend = RedisBackend(self.redis_client)
-                        self.using_redis = True
-                        self.redis_errors = 0
-                        logger.info("Reconnected to Redis, switching back to Redis backend")
-                        return True
-                except (RedisError, ConnectionError) as e:
-                    logger.warning("Redis still unavailable", error=str(e))
-                    self.using_redis = False
-                    return False
+                return await self._reconnect()
                     
             return self.using_redis
     
+    async def _reconnect(self):
+        """Try to switch back to Redis. Caller holds the state lock.
+        
+        Returns:
+            bool: True if the Redis backend is usable again
+        """
+        try:
+            # Try to reconnect
+            logger.info("Attempting to reconnect to Redis")
+            if self.redis_client is None:
+                # Full initialization needed
+                result = await self._connect()
+                if result:
+                    logger.info("Redis reconnected and backend initialized")
+                return result
+            else:
+                # Just verify connection
+                await self.redis_client.ping()
+                # Create Redis backend if needed
+                if self.redis_backend is None:
+                    self.redis_backend = RedisBackend(self.redis_client)
+                self.using_redis = True
+                self.redis_errors = 0
+                logger.info("Reconnected to Redis, switching back to Redis backend")
+                return True
+        except (RedisError, ConnectionError) as e:
+            logger.warning("Redis still unavailable", error=str(e))
+            self.using_redis = False
+            return False
+    
     async def _handle_redis_error(self, e):
         """Handle Redis error and switch to memory if threshold exceeded."""
-        # Only lock when we're changing state
-        async with self._state_lock:
-            self.redis_errors += 1
-            if self.redis_errors >= self.max_redis_errors:
-                logger.warning(
-                    "Redis error threshold reached, switching to memory backend",
-                    errors=self.redis_errors,
-                    max_errors=self.max_redis_errors
-                )
-                self.using_redis = False
-            else:
-                logger.warning(
-                    "Redis operation failed",
-                    error=str(e),
-                    errors=f"{self.redis_errors}/{self.max_redis_errors}"
-                )
+        # No lock: the event loop runs this without a suspension point between
+        # the increment and the check, so no other task can interleave
+        self.redis_errors += 1
+        if self.redis_errors >= self.max_redis_errors:
+            logger.warning(
+                "Redis error threshold reached, switching to memory backend",
+                errors=self.redis_errors,
+                max_errors=self.max_redis_errors
+            )
+            self.using_redis = False
+        else:
+            logger.warning(
+                "Redis operation failed",
+                error=str(e),
+                errors=f"{self.redis_errors}/{self.max_redis_errors}"
+            )
     
-    async def _with_fallback(self, redis_func, memory_func, *args, **kwargs):
-        """Execute function with Redis, falling back to memory on failure."""
-        # Check Redis health periodically - this internally uses locking only when needed
-        await self.check_redis_health()
-        
-        # Read current state without locking
-        current_using_redis = self.using_redis and self.redis_backend is not None
+    async def _with_fallback(self, method_name, *args):
+        """Call a backend method on Redis, falling back to memory on failure.
         
-        # Only log backend changes, not every operation
-        if current_using_redis:
+        The method is looked up by name so callers don't allocate closures
+        for each operation.
+        """
+        # Health is tracked by the background task; just read the current state
+        redis_backend = self.redis_backend
+        if self.using_redis and redis_backend is not None:
             try:
                 # Use Redis backend without locking
-                return await redis_func(*args, **kwargs)
+                return await getattr(redis_backend, method_name)(*args)
             except (RedisError, ConnectionError) as e:
                 # Redis failed, log and use memory backend
                 await self._handle_redis_error(e)
                 # Immediately switch to memory for this request
                 logger.warning("Switching to memory backend for this request due to Redis error", error=str(e))
-                return await memory_func(*args, **kwargs)
-        else:
-            # Use memory backend without locking
-            return await memory_func(*args, **kwargs)
+        
+        # Use memory backend without locking
+        return await getattr(self.memory_backend, method_name)(*args)
     
     async def is_allowed(self, rule, user, group):
         """Check if request is allowed by rate limits."""
         # No lock needed for regular operations, only for backend switching
-        result = await self._with_fallback(
-            lambda: self.redis_backend.is_allowed(rule, user, group),
-            lambda: self.memory_backend.is_allowed(rule, user, group)
-        )
+        result = await self._with_fallback("is_allowed", rule, user, group)
         
-        # Only log when a request is blocked, not for every check
-        if not result:
+        # Only log when a request is blocked and INFO records would be kept
+        if not result and logger._core.min_level <= _INFO_LEVEL_NO:
             logger.info(
                 "Rate limit exceeded", 
                 user=user, 
                 group=group, 
-                backend="redis" if self.using_redis else "memory"
+                backend=self.backend_name
             )
             
         return result
@@ -186,26 +221,45 @@ class ResilientRateLimitBackend(BaseBackend):
     async def is_blocking(self, user):
         """Check if the user is blocked."""
         # No lock needed for regular operations
-        return await self._with_fallback(
-            lambda: self.redis_backend.is_blocking(user),
-            lambda: self.memory_backend.is_blocking(user)
-        )
+        return await self._with_fallback("is_blocking", user)
     
-    async def retry_after(self, rule, user, group):
-        """Get retry-after time in seconds."""
+    async def retry_after(self, path, user, rule):
+        """Get retry-after time in seconds, or 0 if the request is allowed.
+        
+        This is the only backend call RateLimitMiddleware makes per request;
+        the wrapped backend checks the block key and updates the counters in
+        one step, so there are no separate checks to batch here.
+        
+        Blocks are remembered locally for at most local_block_ttl seconds,
+        so a client that keeps sending while blocked is refused without a
+        Redis round trip. The backend reports the rule's whole window rather
+        than the time left in it, so blocks are not cached for that long:
+        the block may lift as soon as the window resets. Allowed requests
+        always go to the backend so every one is counted.
+        """
+        key = (path, user, rule.group)
+        now = time.monotonic()
+        cached = self._blocked_until.get(key)
+        if cached is not None:
+            if cached[0] > now:
+                return cached[1]
+            del self._blocked_until[key]
+        
         # No lock needed for regular operations
-        result = await self._with_fallback(
-            lambda: self.redis_backend.retry_after(rule, user, group),
-            lambda: self.memory_backend.retry_after(rule, user, group)
-        )
+        result = await self._with_fallback("retry_after", path, user, rule)
+        
+        if result > 0:
+            if len(self._blocked_until) >= BLOCKED_CACHE_MAX_ENTRIES:
+                self._blocked_until.clear()
+            self._blocked_until[key] = (now + min(self.local_block_ttl, result), result)
         
         # Only log significant retry periods
-        if result > 5:  # Only log if retry is more than 5 seconds
+        if result > 5 and logger._core.min_level <= _INFO_LEVEL_NO:  # Only log if retry is more than 5 seconds
             logger.info(
                 "Rate limit retry period", 
                 user=user, 
                 retry_seconds=result,
-                backend="redis" if self.using_redis else "memory"
+                backend=self.backend_name
             )
             
         return result
@@ -219,20 +273,25 @@ class ResilientRateLimitBackend(BaseBackend):
             self.redis_backend = None
             self.using_redis = False
             
-            # Ensure memory backend is initialized
-            if not hasattr(self, 'memory_backend') or self.memory_backend is None:
-                self.memory_backend = MemoryBackend()
-            
             logger.info("Memory backend ready")
             return False
     
     async def close(self):
         """Close Redis and memory backends."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        
         # Lock for closing resources
         async with self._state_lock:
             if self.redis_client:
                 try:
-                    await self.redis_client.close()
+                    # The client does not own the pool it was given, so close both
+                    await self.redis_client.aclose(close_connection_pool=True)
                     logger.info("Redis connection closed")
                 except Exception as e:
                     logger.error("Error closing Redis connection", error=str(e))
@@ -1,5 +1,7 @@
 """FastAPI rate limiting middleware setup."""
 
+import re
+
 from fastapi import FastAPI
 from ratelimit import RateLimitMiddleware, Rule
 from loguru import logger
@@ -11,6 +13,89 @@ from app.core.rate_limit.auth import simple_auth, custom_on_blocked
 # Global variable to store the rate limit backend for access during shutdown
 rate_limit_backend = None
 
+# Rate limit rules by path pattern. The first pattern that matches wins, so the
+# more specific prefix comes first. Anchored literal prefixes are matched with
+# str.startswith by PrefixRateLimitMiddleware.
+RATE_LIMIT_RULES = {
+    # API endpoints: 1 request per second per IP
+    r"^/api/": [
+        Rule(second=30, group="api"),  # 1 request per second for API endpoints
+        Rule(group="admin")  # No limits for admin group
+    ],
+    # Public endpoints: 5 requests per minute per IP
+    r"^/": [
+        Rule(minute=30, group="public"),  # 5 requests per minute for public endpoints
+        Rule(group="admin")  # No limits for admin group
+    ]
+}
+
+# Paths that bypass rate limiting entirely: probes and browser noise that would
+# otherwise pay for authentication and a backend round trip on every hit
+RATE_LIMIT_EXEMPT_PATHS = frozenset({
+    f"{settings.API_PREFIX}/health",
+    f"{settings.API_PREFIX}/health/ready",
+    f"{settings.API_PREFIX}/health/live",
+    "/favicon.ico",
+})
+
+class _PrefixMatch:
+    """Match result for a literal prefix; group() returns the prefix."""
+    
+    __slots__ = ("_text",)
+    
+    def __init__(self, text: str):
+        self._text = text
+    
+    def group(self, *args) -> str:
+        return self._text
+
+
+class _PrefixPattern:
+    """Stand-in for an anchored literal regex such as ``^/api/``."""
+    
+    __slots__ = ("prefix", "_match")
+    
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self._match = _PrefixMatch(prefix)
+    
+    def match(self, path: str):
+        return self._match if path.startswith(self.prefix) else None
+
+
+class PrefixRateLimitMiddleware(RateLimitMiddleware):
+    """RateLimitMiddleware that matches literal path prefixes without regex.
+    
+    The base middleware runs pattern.match(path) for each configured pattern
+    on every request and uses match.group() as the limit zone. Patterns of the
+    form ``^<literal>`` are swapped for prefix matchers with the same results;
+    any other pattern keeps its compiled regex.
+    
+    Requests for RATE_LIMIT_EXEMPT_PATHS are passed straight to the app.
+    """
+    
+    def __init__(self, app, **kwargs):
+        super().__init__(app, **kwargs)
+        self.config = {
+            _literal_prefix(pattern): rules for pattern, rules in self.config.items()
+        }
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in RATE_LIMIT_EXEMPT_PATHS:
+            return await self.app(scope, receive, send)
+        return await super().__call__(scope, receive, send)
+
+
+def _literal_prefix(pattern: re.Pattern):
+    """Return a prefix matcher for ``^<literal>`` patterns, else the pattern."""
+    source = pattern.pattern
+    if source.startswith("^") and pattern.flags == re.UNICODE:
+        prefix = source[1:]
+        if re.escape(prefix) == prefix:
+            return _PrefixPattern(prefix)
+    return pattern
+
+
 def setup_rate_limiting(app: FastAPI) -> ResilientRateLimitBackend:
     """Configure rate limiting middleware with Redis backend.
     
@@ -26,26 +111,12 @@ def setup_rate_limiting(app: FastAPI) -> ResilientRateLimitBackend:
     backend = ResilientRateLimitBackend(settings.REDIS_URI)
     rate_limit_backend = backend
     
-    # Define rate limit rules
-    rate_limit_config = {
-        # API endpoints: 1 request per second per IP
-        r"^/api/": [
-            Rule(second=30, group="api"),  # 1 request per second for API endpoints
-            Rule(group="admin")  # No limits for admin group
-        ],
-        # Public endpoints: 5 requests per minute per IP
-        r"^/": [
-            Rule(minute=30, group="public"),  # 5 requests per minute for public endpoints
-            Rule(group="admin")  # No limits for admin group
-        ]
-    }
-    
     # Add rate limiting middleware
     app.add_middleware(
-        RateLimitMiddleware,
+        PrefixRateLimitMiddleware,
         authenticate=simple_auth,
         backend=backend,
-        config=rate_limit_config,
+        config=RATE_LIMIT_RULES,
         on_blocked=custom_on_blocked
     )
     
@@ -6,6 +6,7 @@ and error handling for async Redis operations.
 """
 
 import asyncio
+import random
 from typing import Optional, Dict, Any, List
 import time
 
@@ -17,6 +18,17 @@ from redis.exceptions import RedisError
 from app.core.config import settings
 
 
+class _MonitoredRedis(redis.Redis):
+    """Redis client that remembers when a command last succeeded."""
+    
+    last_success: float = 0.0
+    
+    async def execute_command(self, *args, **options):
+        result = await super().execute_command(*args, **options)
+        self.last_success = time.monotonic()
+        return result
+
+
 class RedisClientManager:
     """
     Async Redis client manager with connection pooling.
@@ -28,25 +40,22 @@ class RedisClientManager:
     - Error handling and recovery
     """
     
-    _instance: Optional["RedisClientManager"] = None
-    _connection_pool: Optional[ConnectionPool] = None
-    _client: Optional[redis.Redis] = None
-    _is_connected: bool = False
-    
-    def __new__(cls):
-        """Singleton pattern to ensure only one Redis client manager exists."""
-        if cls._instance is None:
-            cls._instance = super(RedisClientManager, cls).__new__(cls)
-            cls._instance._initialize()
-        return cls._instance
+    def __init__(self):
+        """Create the manager; use the module-level redis_manager instead of new instances."""
+        self._connection_pool: Optional[ConnectionPool] = None
+        self._client: Optional[redis.Redis] = None
+        self._is_connected: bool = False
+        self._initialize()
     
     def _initialize(self) -> None:
         """Initialize the Redis connection pool."""
         try:
-            self._connection_pool = redis.ConnectionPool.from_url(
+            # Bounded pool: under bursts commands wait for a free connection
+            # instead of opening new sockets
+            self._connection_pool = redis.BlockingConnectionPool.from_url(
                 settings.REDIS_URI,
-                max_connections=20,
-                decode_responses=True
+                max_connections=settings.REDIS_POOL_MAX,
+                timeout=settings.REDIS_POOL_TIMEOUT
             )
             logger.debug(f"Redis connection pool created for {settings.REDIS_URI}")
         except Exception as e:
@@ -76,12 +85,23 @@ class RedisClientManager:
                 self._initialize()
                 
             if self._connection_pool:
-                self._client = redis.Redis(connection_pool=self._connection_pool)
+                self._client = _MonitoredRedis(connection_pool=self._connection_pool)
             else:
                 raise ConnectionError("Redis connection pool is not available")
                 
         return self._client
     
+    def seconds_since_last_success(self) -> float:
+        """
+        Get the time elapsed since a command last succeeded on the shared client.
+        
+        Returns:
+            float: Seconds since the last successful command, or infinity if none
+        """
+        if self._client is None or not self._client.last_success:
+            return float("inf")
+        return time.monotonic() - self._client.last_success
+    
     async def ping(self) -> bool:
         """
         Test the Redis connection with a ping command.
@@ -134,6 +154,7 @@ class RedisClientManager:
         self._initialize()
         
         # Try to reconnect with exponential backoff
+        backoff_steps = tuple(delay * (1 << attempt) for attempt in range(max_retries))
         for attempt in range(max_retries):
             logger.debug(f"Redis reconnection attempt {attempt + 1}/{max_retries}")
             
@@ -147,8 +168,7 @@ class RedisClientManager:
                 logger.warning(f"Redis reconnection failed (attempt {attempt + 1}): {str(e)}")
                 
             # Exponential backoff with jitter
-            backoff_time = delay * (2 ** attempt) * (0.9 + 0.2 * (time.time() % 1))
-            await asyncio.sleep(backoff_time)
+            await asyncio.sleep(backoff_steps[attempt] * random.uniform(0.9, 1.1))
             
         self._is_connected = False
         logger.error(f"Redis reconnection failed after {max_retries} attempts")
@@ -168,5 +188,5 @@ class RedisClientManager:
         logger.debug("Redis connections closed")
 
 
-# Singleton instance
+# Singleton instance, created once at import
 redis_manager = RedisClientManager() 
\ No newline at end of file
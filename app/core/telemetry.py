@@ -3,6 +3,7 @@
 import logging
 from contextlib import suppress
 from functools import lru_cache
+from types import MappingProxyType, SimpleNamespace
 from typing import Optional, Tuple, Union, Dict, Any, List
 
 from opentelemetry import trace, metrics
@@ -38,6 +39,27 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Exporter classes for the configured OTLP protocol, resolved once at import.
+# gRPC exporters need insecure=True; anything other than "grpc" uses HTTP.
+_USE_GRPC = settings.OTEL_EXPORTER_OTLP_PROTOCOL.lower() == "grpc"
+if _USE_GRPC:
+    _SpanExporter, _MetricExporter = OTLPGrpcSpanExporter, OTLPGrpcMetricExporter
+    _LogExporter = OTLPGrpcLogExporter if LOGS_AVAILABLE else None
+    _EXPORTER_KWARGS: Dict[str, Any] = {"insecure": True}
+else:
+    _SpanExporter, _MetricExporter = OTLPHttpSpanExporter, OTLPHttpMetricExporter
+    _LogExporter = OTLPHttpLogExporter if LOGS_AVAILABLE else None
+    _EXPORTER_KWARGS = {}
+
+# Handles to the custom metric instruments, set by _setup_custom_metrics.
+# Hot paths record on these directly instead of re-creating instruments.
+METRICS = SimpleNamespace(
+    url_counter=None,
+    redirect_counter=None,
+    url_create_histogram=None,
+    url_lookup_histogram=None,
+)
+
 
 @lru_cache
 def setup_telemetry() -> Tuple[Optional[TracerProvider], Optional[MeterProvider], Optional[object]]:
@@ -51,7 +73,7 @@ def setup_telemetry() -> Tuple[Optional[TracerProvider], Optional[MeterProvider]
             "service.name": settings.OTEL_SERVICE_NAME,
             "service.version": settings.APP_VERSION,
             "deployment.environment": settings.ENVIRONMENT,
-            **_parse_resource_attributes(settings.OTEL_RESOURCE_ATTRIBUTES)
+            **_RESOURCE_ATTRIBUTES
         })
 
         tracer_provider = _setup_tracing(resource)
@@ -70,9 +92,14 @@ def instrument_app(db_engine=None, redis_client=None) -> None:
         return
 
     try:
-        # Instrument logging
-        LoggingInstrumentor().instrument(tracer_provider=trace.get_tracer_provider())
-        logger.info("Logging instrumentation enabled")
+        # Instrument logging; this wraps the log record factory, so it adds
+        # work to every stdlib log call and is only worth it for correlation
+        if settings.OTEL_PYTHON_LOG_CORRELATION:
+            LoggingInstrumentor().instrument(
+                tracer_provider=trace.get_tracer_provider(),
+                set_logging_format=False
+            )
+            logger.info("Logging instrumentation enabled")
 
         # Instrument SQLAlchemy if engine is provided
         if db_engine:
@@ -110,17 +137,19 @@ def _setup_tracing(resource: Resource) -> TracerProvider:
     )
     trace.set_tracer_provider(tracer_provider)
 
-    if settings.OTEL_EXPORTER_OTLP_PROTOCOL.lower() == "grpc":
-        otlp_exporter = OTLPGrpcSpanExporter(
-            endpoint=settings.OTEL_EXPORTER_OTLP_ENDPOINT,
-            insecure=True
-        )
-    else:
-        otlp_exporter = OTLPHttpSpanExporter(
-            endpoint=settings.OTEL_EXPORTER_OTLP_ENDPOINT
-        )
+    otlp_exporter = _SpanExporter(
+        endpoint=settings.OTEL_EXPORTER_OTLP_ENDPOINT,
+        **_EXPORTER_KWARGS
+    )
 
-    tracer_provider.add_span_processor(BatchSpanProcessor(otlp_exporter))
+    # Large, infrequent batches keep export work off the request path under bursts
+    tracer_provider.add_span_processor(BatchSpanProcessor(
+        otlp_exporter,
+        max_queue_size=settings.OTEL_BSP_MAX_QUEUE_SIZE,
+        max_export_batch_size=settings.OTEL_BSP_MAX_EXPORT_BATCH_SIZE,
+        schedule_delay_millis=settings.OTEL_BSP_SCHEDULE_DELAY_MILLIS,
+        export_timeout_millis=settings.OTEL_BSP_EXPORT_TIMEOUT_MILLIS
+    ))
     logger.info(f"OpenTelemetry tracer configured with {settings.OTEL_EXPORTER_OTLP_PROTOCOL} exporter")
     
     return tracer_provider
@@ -128,19 +157,15 @@ def _setup_tracing(resource: Resource) -> TracerProvider:
 
 def _setup_metrics(resource: Resource) -> MeterProvider:
     """Set up metrics with the provided resource."""
-    if settings.OTEL_EXPORTER_OTLP_PROTOCOL.lower() == "grpc":
-        metric_exporter = OTLPGrpcMetricExporter(
-            endpoint=settings.OTEL_EXPORTER_OTLP_METRICS_ENDPOINT,
-            insecure=True
-        )
-    else:
-        metric_exporter = OTLPHttpMetricExporter(
-            endpoint=settings.OTEL_EXPORTER_OTLP_METRICS_ENDPOINT
-        )
+    metric_exporter = _MetricExporter(
+        endpoint=settings.OTEL_EXPORTER_OTLP_METRICS_ENDPOINT,
+        **_EXPORTER_KWARGS
+    )
     
     reader = PeriodicExportingMetricReader(
         metric_exporter,
-        export_interval_millis=settings.OTEL_METRICS_EXPORT_INTERVAL_MILLIS
+        export_interval_millis=settings.OTEL_METRICS_EXPORT_INTERVAL_MILLIS,
+        export_timeout_millis=settings.OTEL_METRICS_EXPORT_TIMEOUT_MILLIS
     )
     
     meter_provider = MeterProvider(resource=resource, metric_readers=[reader])
@@ -157,15 +182,10 @@ def _setup_logging(resource: Resource) -> Optional[object]:
         return None
     
     try:
-        if settings.OTEL_EXPORTER_OTLP_PROTOCOL.lower() == "grpc":
-            log_exporter = OTLPGrpcLogExporter(
-                endpoint=settings.OTEL_EXPORTER_OTLP_LOGS_ENDPOINT,
-                insecure=True
-            )
-        else:
-            log_exporter = OTLPHttpLogExporter(
-                endpoint=settings.OTEL_EXPORTER_OTLP_LOGS_ENDPOINT
-            )
+        log_exporter = _LogExporter(
+            endpoint=settings.OTEL_EXPORTER_OTLP_LOGS_ENDPOINT,
+            **_EXPORTER_KWARGS
+        )
         
         logger_provider = LoggerProvider(resource=resource)
         logger_provider.add_log_record_processor(BatchLogRecordProcessor(log_exporter))
@@ -186,26 +206,26 @@ def _setup_custom_metrics() -> None:
         meter = metrics.get_meter(f"{settings.OTEL_SERVICE_NAME}_meter")
         
         # URL shortening metrics
-        url_counter = meter.create_counter(
+        METRICS.url_counter = meter.create_counter(
             name="url_shortener.urls.created",
             description="Number of URLs shortened",
             unit="1"
         )
         
-        redirect_counter = meter.create_counter(
+        METRICS.redirect_counter = meter.create_counter(
             name="url_shortener.redirects",
             description="Number of URL redirects",
             unit="1"
         )
         
         # Timing histograms
-        url_create_histogram = meter.create_histogram(
+        METRICS.url_create_histogram = meter.create_histogram(
             name="url_shortener.url_creation.duration",
             description="URL creation duration",
             unit="ms"
         )
         
-        url_lookup_histogram = meter.create_histogram(
+        METRICS.url_lookup_histogram = meter.create_histogram(
             name="url_shortener.url_lookup.duration",
             description="URL lookup duration",
             unit="ms"
@@ -246,13 +266,23 @@ def _parse_resource_attributes(attributes_str: str) -> Dict[str, str]:
     return attributes
 
 
+# Resource attributes from settings, parsed once and shared read-only
+_RESOURCE_ATTRIBUTES = MappingProxyType(_parse_resource_attributes(settings.OTEL_RESOURCE_ATTRIBUTES))
+
+
+@lru_cache(maxsize=32)
 def get_tracer(name: str = None) -> trace.Tracer:
-    """Get a tracer for creating spans."""
+    """Get a tracer for creating spans.
+    
+    Cached per name; tracers obtained before the SDK provider is installed
+    are proxies that switch over to it, so reuse stays valid.
+    """
     name = name or settings.OTEL_SERVICE_NAME
     return trace.get_tracer(name)
 
 
+@lru_cache(maxsize=32)
 def get_meter(name: str = None) -> metrics.Meter:
-    """Get a meter for creating metrics."""
+    """Get a meter for creating metrics, cached per name."""
     name = name or settings.OTEL_SERVICE_NAME
     return metrics.get_meter(name)
@@ -1,68 +1,147 @@
-"""URL access logging using Loguru's built-in async features."""
+"""URL access logging with buffered, batched writes.
 
-from loguru import logger
-import sys
+Each redirect appends one pre-serialized JSON line to a bounded in-memory
+buffer. A background task writes the buffer to ``url_access.json`` in batches,
+so the redirect path never formats a log record or touches the disk.
+"""
+
+import asyncio
 import os
-from datetime import datetime
+import time
+from collections import deque
+from typing import Deque, Optional
+
+import orjson
+from loguru import logger
 
 from app.core.config import settings
 
-# Create a new logger instance specifically for URL access logs
-url_access_logger = None
+# Serialized access records waiting to be written; the oldest are dropped when full
+_buffer: Deque[bytes] = deque(maxlen=settings.URL_ACCESS_LOG_BUFFER_SIZE)
+_flush_wakeup: Optional[asyncio.Event] = None
+_flush_task: Optional[asyncio.Task] = None
+# Set by close_url_logging so the writer exits after its current flush
+_closing = False
+_fd: Optional[int] = None
+# Reused for every batch written, grown when a batch does not fit
+_write_buffer = bytearray(1 << 20)
+_log_path = os.path.join(settings.LOG_DIR, "url_access.json")
+
+
+def setup_url_logging() -> None:
+    """Open the URL access log and start the background writer."""
+    global _flush_wakeup, _flush_task, _fd
 
-def setup_url_logging():
-    """Configure the URL access logger with async processing."""
-    global url_access_logger
-    
-    # Ensure log directory exists
     os.makedirs(settings.LOG_DIR, exist_ok=True)
-    
-    # Create a separate logger instance for URL access logs
-    url_access_logger = logger.bind(event_type="url_access")
-    
-    # Remove any existing handlers to avoid duplication
-    logger.configure(handlers=[])
-    
-    # Add specific handlers for URL access logging
-    logger.add(
-        f"{settings.LOG_DIR}/url_access.log",
-        format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level} | IP:{extra[ip]} | Code:{extra[short_code]} | {message}",
-        rotation="10 MB", 
-        retention="7 days",
-        enqueue=True,  # This enables Loguru's internal queue
-        level="INFO",
-        backtrace=False,
-        diagnose=False,
-        filter=lambda record: record["extra"].get("event_type") == "url_access"
-    )
-    
-    # Add JSON format handler
-    logger.add(
-        f"{settings.LOG_DIR}/url_access.json",
-        serialize=True,
-        enqueue=True,
-        level="INFO",
-        filter=lambda record: record["extra"].get("event_type") == "url_access"
-    )
-    
-    return url_access_logger
+    if _fd is None:
+        _fd = _open_log()
+
+    if _flush_task is None or _flush_task.done():
+        _flush_wakeup = asyncio.Event()
+        _flush_task = asyncio.create_task(_flush_loop())
+
+
+async def close_url_logging() -> None:
+    """Stop the background writer and write any buffered records."""
+    global _flush_task, _fd, _closing
+
+    if _flush_task is not None and not _flush_task.done():
+        # Cancelling would not stop a write already running in a thread, which
+        # could then race the final flush and the close below. Ask the writer
+        # to exit and wait for it instead.
+        _closing = True
+        _flush_wakeup.set()
+        await asyncio.gather(_flush_task, return_exceptions=True)
+    _flush_task = None
+    _closing = False
+
+    if _fd is not None:
+        await _flush()
+        os.close(_fd)
+        _fd = None
+
 
 def log_url_access(short_code: str, ip_address: str, user_agent: str = ""):
     """
-    Log a URL access event using Loguru's non-blocking logging.
-    
+    Record a URL access event for the background writer.
+
     Args:
         short_code: The shortened URL code that was accessed
         ip_address: The client's IP address
         user_agent: Optional user agent string
     """
-    if url_access_logger is None:
-        setup_url_logging()
-        
-    # Use bound logger with contextual data
-    url_access_logger.bind(
-        ip=ip_address,
-        short_code=short_code,
-        user_agent=user_agent,
-        timestamp=datetime.utcnow().isoformat()
-    ).info(f"URL accessed: {short_code}") 
\ No newline at end of file
+    _buffer.append(orjson.dumps(
+        {"ts": time.time_ns(), "ip": ip_address, "code": short_code, "ua": user_agent},
+        option=orjson.OPT_APPEND_NEWLINE
+    ))
+    if len(_buffer) >= settings.URL_ACCESS_LOG_BATCH_SIZE and _flush_wakeup is not None:
+        _flush_wakeup.set()
+
+
+async def _flush_loop() -> None:
+    """Write buffered records every flush interval, or sooner once a batch fills up."""
+    while not _closing:
+        try:
+            await asyncio.wait_for(_flush_wakeup.wait(), timeout=settings.URL_ACCESS_LOG_FLUSH_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        _flush_wakeup.clear()
+        try:
+            await _flush()
+        except OSError as e:
+            # Keep the writer alive; records stay bounded by the buffer size
+            logger.error(f"Error writing URL access log: {e}")
+
+
+async def _flush() -> None:
+    """Write everything currently buffered, one write per batch."""
+    batch_size = settings.URL_ACCESS_LOG_BATCH_SIZE
+    while _buffer and _fd is not None:
+        size = 0
+        for _ in range(min(len(_buffer), batch_size)):
+            record = _buffer.popleft()
+            end = size + len(record)
+            if end > len(_write_buffer):
+                _write_buffer.extend(bytes(max(end, 2 * len(_write_buffer)) - len(_write_buffer)))
+            _write_buffer[size:end] = record
+            size = end
+        await asyncio.to_thread(_write, _write_buffer, size)
+
+
+def _open_log() -> int:
+    return os.open(_log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+
+def _write(data: bytearray, size: int) -> None:
+    """Append the first ``size`` bytes of ``data`` to the log file, rotating it once it grows too large."""
+    with memoryview(data) as view:
+        written = 0
+        while written < size:
+            written += os.write(_fd, view[written:size])
+
+    if os.fstat(_fd).st_size >= settings.URL_ACCESS_LOG_MAX_BYTES:
+        _rotate()
+
+
+def _rotate() -> None:
+    """Move the log aside and switch to a fresh file.
+
+    Files are renamed while the old descriptor stays open, and it is only
+    closed once the new file is open, so ``_fd`` always refers to an open
+    log file even if a rename or the open fails.
+    """
+    global _fd
+
+    # url_access.json -> .1 -> .2 ..., dropping the oldest
+    backups = settings.URL_ACCESS_LOG_BACKUP_COUNT
+    for index in range(backups - 1, 0, -1):
+        source = f"{_log_path}.{index}"
+        if os.path.exists(source):
+            os.replace(source, f"{_log_path}.{index + 1}")
+    if backups > 0:
+        os.replace(_log_path, f"{_log_path}.1")
+    else:
+        os.remove(_log_path)
+
+    old_fd, _fd = _fd, _open_log()
+    os.close(old_fd)
@@ -1,6 +1,8 @@
 """Database module for the URL shortener application."""
-from app.db.base import engine, get_engine, DatabaseHealthCheck
-from app.db.session import get_db, db_transaction, SessionManager, db_dependency
+from typing import Any
+
+from app.db.base import get_engine, DatabaseHealthCheck, DatabaseProbe, database_probe
+from app.db.session import get_db, get_db_session_factory, db_transaction, SessionManager, db_dependency
 
 # Resilience imports are commented out for now
 # from app.db.resilience import (
@@ -15,7 +17,10 @@ __all__ = [
     "engine",
     "get_engine",
     "DatabaseHealthCheck",
+    "DatabaseProbe",
+    "database_probe",
     "get_db",
+    "get_db_session_factory",
     "db_transaction",
     "SessionManager",
     "db_dependency",
@@ -26,3 +31,10 @@ __all__ = [
     # "db_circuit_breaker",
     # "CircuitBreakerError",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Create the shared engine on first access rather than at import."""
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
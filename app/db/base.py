@@ -8,13 +8,17 @@ It includes:
 - Health check functionality
 """
 
-from typing import AsyncGenerator, Dict, Optional
+from functools import lru_cache
+from typing import Any, AsyncGenerator, Dict, Optional
 import asyncio
+import time
 import logging
 import warnings
 import os
 from contextlib import asynccontextmanager
 
+import asyncpg
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -29,7 +33,15 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-# Mapping of environment to SQLAlchemy engine configurations
+# Database URL rendered once; shared by the engines and the probe connection
+_ENGINE_URL = str(settings.SQLALCHEMY_DATABASE_URI)
+
+# Connectivity check statement, built once and shared by every probe
+HEALTHCHECK_STATEMENT = text("SELECT 1")
+
+# Mapping of environment to SQLAlchemy engine configurations.
+# pool_size + max_overflow bounds the queries one worker can have in flight, so it
+# should cover the worker's expected concurrent requests rather than a thread count.
 ENGINE_CONFIGS: Dict[str, Dict] = {
     "development": {
         "echo": True,
@@ -45,7 +57,11 @@ ENGINE_CONFIGS: Dict[str, Dict] = {
         "max_overflow": settings.POSTGRES_POOL_MAX_OVERFLOW,
         "pool_timeout": settings.POSTGRES_POOL_TIMEOUT,
         "pool_recycle": settings.POSTGRES_POOL_RECYCLE,
-        "pool_pre_ping": True,
+        # On by default: recycling only covers idle timeouts, not failovers or
+        # restarts, which would otherwise surface as errors on live requests
+        "pool_pre_ping": settings.POSTGRES_POOL_PRE_PING,
+        # Reuse the most recently returned connections so a warm subset stays busy
+        "pool_use_lifo": True,
     },
     "testing": {
         "echo": False,
@@ -54,6 +70,23 @@ ENGINE_CONFIGS: Dict[str, Dict] = {
 }
 
 
+# Fallback pool for DatabaseProbe on drivers other than asyncpg (e.g. SQLite
+# in tests); PostgreSQL probes use a single raw connection instead
+PROBE_ENGINE_CONFIGS: Dict[str, Dict] = {
+    "development": {
+        "echo": False,
+        "pool_size": settings.POSTGRES_PROBE_POOL_SIZE,
+        "max_overflow": 0,
+        "pool_timeout": 5,
+        "pool_recycle": settings.POSTGRES_POOL_RECYCLE,
+    },
+    "testing": {
+        "echo": False,
+        "poolclass": NullPool,
+    },
+}
+
+
 def get_engine_config() -> Dict:
     """Get the appropriate engine configuration based on the environment.
     
@@ -64,35 +97,79 @@ def get_engine_config() -> Dict:
     return ENGINE_CONFIGS.get(env, ENGINE_CONFIGS["development"])
 
 
+@lru_cache(maxsize=None)
 def get_engine() -> AsyncEngine:
-    """Create and configure an async SQLAlchemy engine.
+    """Create and configure the shared async SQLAlchemy engine on first use.
     
     Returns:
         AsyncEngine: Configured SQLAlchemy async engine instance.
     """
-    engine_url = str(settings.SQLALCHEMY_DATABASE_URI)
     engine_config = get_engine_config()
     
-    logger.info(f"Creating database engine with URL: {engine_url}")
+    logger.info(
+        f"Creating database engine with URL: {make_url(_ENGINE_URL).render_as_string(hide_password=True)}"
+    )
     
     return create_async_engine(
-        engine_url,
+        _ENGINE_URL,
         future=True,
         **engine_config,
     )
 
 
-# Shared async engine instance
-engine = get_engine()
+@lru_cache(maxsize=None)
+def get_probe_engine() -> AsyncEngine:
+    """Create the async engine reserved for health and readiness probes on first use.
+    
+    Only DatabaseProbe uses it, and only for drivers other than asyncpg.
+    
+    Returns:
+        AsyncEngine: SQLAlchemy async engine with a small, fixed-size pool.
+    """
+    env = settings.ENVIRONMENT.value
+    engine_config = PROBE_ENGINE_CONFIGS.get(env, PROBE_ENGINE_CONFIGS["development"])
+    
+    return create_async_engine(
+        _ENGINE_URL,
+        future=True,
+        **engine_config,
+    )
 
-# Async session factory
-async_session_factory = async_sessionmaker(
-    bind=engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
-)
+
+@lru_cache(maxsize=None)
+def get_session_factory() -> async_sessionmaker:
+    """Get the async session factory bound to the shared engine.
+    
+    Returns:
+        async_sessionmaker: Session factory, created on first use.
+    """
+    return async_sessionmaker(
+        bind=get_engine(),
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+
+# Module attributes created on first access instead of at import
+_LAZY_ATTRIBUTES = {
+    "engine": get_engine,
+    "probe_engine": get_probe_engine,
+    "async_session_factory": get_session_factory,
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Create engines and session factories lazily (PEP 562).
+    
+    Importing this module for its helpers or models no longer builds
+    connection pools; they are created when something first needs them.
+    """
+    factory = _LAZY_ATTRIBUTES.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return factory()
 
 
 @asynccontextmanager
@@ -102,7 +179,7 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
     Yields:
         AsyncSession: SQLAlchemy async session
     """
-    session = async_session_factory()
+    session = get_session_factory()()
     try:
         yield session
     finally:
@@ -119,15 +196,15 @@ class DatabaseHealthCheck:
         Returns:
             Dict: Health check result containing status and latency information
         """
-        start_time = asyncio.get_event_loop().time()
+        start_time = time.monotonic()
         status = "healthy"
         error_message = None
         latency_ms = 0
         
         try:
-            async with async_session_factory() as session:
-                await session.execute(text("SELECT 1"))
-            latency_ms = int((asyncio.get_event_loop().time() - start_time) * 1000)
+            async with get_session_factory()() as session:
+                await session.execute(HEALTHCHECK_STATEMENT)
+            latency_ms = int((time.monotonic() - start_time) * 1000)
         except Exception as e:
             status = "unhealthy"
             error_message = str(e)
@@ -138,3 +215,70 @@ class DatabaseHealthCheck:
             "latency_ms": latency_ms,
             "error": error_message,
         }
+
+
+class DatabaseProbe:
+    """Single long-lived connection reserved for health and readiness probes.
+    
+    For PostgreSQL the probe holds one raw asyncpg connection, entirely outside
+    the SQLAlchemy pools, guarded by a lock and re-opened after any error.
+    Other drivers (e.g. SQLite in tests) fall back to the probe engine.
+    """
+    
+    def __init__(self, database_uri: str, timeout: float = 1.0):
+        """Initialize the probe without connecting.
+        
+        Args:
+            database_uri: SQLAlchemy database URI of the application database
+            timeout: Seconds allowed for connecting and for the probe query
+        """
+        url = make_url(database_uri)
+        self._dsn = None
+        if url.get_backend_name() == "postgresql":
+            self._dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+        self._timeout = timeout
+        self._connection: Optional[asyncpg.Connection] = None
+        self._lock = asyncio.Lock()
+    
+    async def check(self) -> bool:
+        """Run SELECT 1 on the probe connection.
+        
+        Returns:
+            bool: True if the database answered as expected
+            
+        Raises:
+            Exception: Any connection or query error, after dropping the connection
+        """
+        if self._dsn is None:
+            async with get_probe_engine().connect() as conn:
+                result = await conn.execute(HEALTHCHECK_STATEMENT)
+                return result.scalar_one() == 1
+        
+        async with self._lock:
+            try:
+                if self._connection is None or self._connection.is_closed():
+                    self._connection = await asyncpg.connect(
+                        self._dsn,
+                        timeout=self._timeout,
+                        command_timeout=self._timeout,
+                        server_settings={"statement_timeout": str(int(self._timeout * 1000))},
+                    )
+                return await self._connection.fetchval("SELECT 1") == 1
+            except Exception:
+                await self._close_connection()
+                raise
+    
+    async def close(self) -> None:
+        """Close the probe connection if it is open."""
+        async with self._lock:
+            await self._close_connection()
+    
+    async def _close_connection(self) -> None:
+        """Drop the current connection without waiting on the server."""
+        connection, self._connection = self._connection, None
+        if connection is not None and not connection.is_closed():
+            connection.terminate()
+
+
+# Shared probe used by the health endpoints
+database_probe = DatabaseProbe(_ENGINE_URL)
@@ -15,14 +15,14 @@ import time
 from asyncio import Lock
 from enum import Enum
 from functools import wraps
+from types import MappingProxyType
 from typing import Callable, TypeVar, Optional, Dict, Any, AsyncGenerator
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.sql import text
 
 from app.core.config import settings
-from app.db.base import get_session
+from app.db.base import HEALTHCHECK_STATEMENT, get_session
 
 logger = logging.getLogger(__name__)
 
@@ -54,7 +54,7 @@ async def initialize_database_connection() -> bool:
         try:
             # Try to establish a connection by running a simple query
             async with get_session() as session:
-                await session.execute(text("SELECT 1"))
+                await session.execute(HEALTHCHECK_STATEMENT)
                 
             logger.info(f"Database connection established successfully on attempt {attempt}")
             return True
@@ -104,30 +104,27 @@ class DatabaseCircuitBreaker:
     when the database is experiencing issues. In the OPEN state, requests
     fail fast without attempting to reach the database.
     """
-    _instance = None
-    
-    def __new__(cls):
-        """Singleton pattern to ensure only one circuit breaker exists."""
-        if cls._instance is None:
-            cls._instance = super(DatabaseCircuitBreaker, cls).__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
     
     def __init__(self):
-        """Initialize the circuit breaker if not already initialized."""
-        if self._initialized:
-            return
-            
+        """Create the breaker; use the module-level circuit_breaker instead of new instances."""
         # Circuit state
         self._state = CircuitState.CLOSED
         self._failure_count = 0
         self._success_count = 0
         self._last_failure_time = 0
+        # Monotonic time after which an open circuit may try HALF-OPEN
+        self._recovery_deadline = 0.0
         
         # Configuration
         self._failure_threshold = settings.DB_CIRCUIT_BREAKER_FAILURE_THRESHOLD
         self._recovery_time = settings.DB_CIRCUIT_BREAKER_RECOVERY_TIME
         self._success_threshold = settings.DB_CIRCUIT_BREAKER_SUCCESS_THRESHOLD
+        # Configuration part of get_stats(), fixed for the breaker's lifetime
+        self._static_stats = MappingProxyType({
+            "failure_threshold": self._failure_threshold,
+            "success_threshold": self._success_threshold,
+            "recovery_time": self._recovery_time,
+        })
         
         # Lock for thread safety in async environment
         self._lock = Lock()
@@ -142,8 +139,6 @@ class DatabaseCircuitBreaker:
             f"Database circuit breaker initialized (failure_threshold={self._failure_threshold}, "
             f"recovery_time={self._recovery_time}s, success_threshold={self._success_threshold})"
         )
-        
-        self._initialized = True
     
     async def execute(self, operation: Callable[..., T], *args, **kwargs) -> T:
         """Execute an operation with circuit breaker protection.
@@ -177,19 +172,23 @@ class DatabaseCircuitBreaker:
         Raises:
             CircuitBreakerError: If circuit is open
         """
+        # Common case: nothing to check or change, so skip the lock
+        if self._state == CircuitState.CLOSED:
+            return
+        
         async with self._lock:
             if self._state == CircuitState.OPEN:
                 # Check if recovery time has elapsed to transition to half-open
-                if time.time() - self._last_failure_time > self._recovery_time:
+                now = time.monotonic()
+                if now > self._recovery_deadline:
                     logger.info("Circuit breaker transitioning from OPEN to HALF-OPEN state")
                     self._state = CircuitState.HALF_OPEN
                     self._success_count = 0
                 else:
                     self._total_bypassed += 1
-                    recovery_time_left = self._recovery_time - (time.time() - self._last_failure_time)
                     raise CircuitBreakerError(
                         f"Circuit breaker is open. "
-                        f"Automatic retry in {recovery_time_left:.1f} seconds."
+                        f"Automatic retry in {self._recovery_deadline - now:.1f} seconds."
                     )
     
     async def _handle_success(self):
@@ -212,6 +211,13 @@ class DatabaseCircuitBreaker:
     
     async def _handle_failure(self, exception):
         """Handle operation failure, potentially opening the circuit."""
+        # Below the threshold a closed circuit only counts the failure, no lock needed
+        if self._state == CircuitState.CLOSED and self._failure_count + 1 < self._failure_threshold:
+            self._last_failure_time = time.time()
+            self._total_failures += 1
+            self._failure_count += 1
+            return
+        
         async with self._lock:
             self._last_failure_time = time.time()
             self._total_failures += 1
@@ -224,6 +230,7 @@ class DatabaseCircuitBreaker:
                         f"after {self._failure_count} failures. Last error: {str(exception)}"
                     )
                     self._state = CircuitState.OPEN
+                    self._recovery_deadline = time.monotonic() + self._recovery_time
                     self._circuit_trip_count += 1
             
             elif self._state == CircuitState.HALF_OPEN:
@@ -232,6 +239,7 @@ class DatabaseCircuitBreaker:
                     f"due to failure: {str(exception)}"
                 )
                 self._state = CircuitState.OPEN
+                self._recovery_deadline = time.monotonic() + self._recovery_time
                 self._circuit_trip_count += 1
     
     def get_stats(self) -> Dict[str, Any]:
@@ -244,9 +252,7 @@ class DatabaseCircuitBreaker:
             "state": self._state,
             "failure_count": self._failure_count,
             "success_count": self._success_count,
-            "failure_threshold": self._failure_threshold,
-            "success_threshold": self._success_threshold,
-            "recovery_time": self._recovery_time,
+            **self._static_stats,
             "last_failure_time": self._last_failure_time,
             "total_failures": self._total_failures,
             "total_successes": self._total_successes,
@@ -262,7 +268,7 @@ class DatabaseCircuitBreaker:
         self._success_count = 0
 
 
-# Singleton instance
+# Singleton instance, created once at import
 circuit_breaker = DatabaseCircuitBreaker()
 
 
@@ -277,31 +283,26 @@ async def get_db_with_circuit_breaker() -> AsyncGenerator[AsyncSession, None]:
     Raises:
         CircuitBreakerError: If circuit breaker is open
     """
-    # First check if circuit is open before even attempting to get a session
+    # Fail fast if the circuit is open, before even attempting to get a session
     await circuit_breaker._check_state()
     
+    # No probe query here: pool_pre_ping already replaces dead connections at
+    # checkout, and the request's own queries decide success or failure
     async with get_session() as session:
         try:
-            # Test the connection
-            await circuit_breaker.execute(session.execute, text("SELECT 1"))
-            
-            try:
-                yield session
-            except SQLAlchemyError as e:
-                logger.exception("Database error occurred")
-                await session.rollback()
-                # Record failure in circuit breaker
-                await circuit_breaker._handle_failure(e)
-                raise
-            except Exception as e:
-                logger.exception("Unexpected error during database session")
-                await session.rollback()
-                raise
-                
+            yield session
+        except SQLAlchemyError as e:
+            logger.exception("Database error occurred")
+            await session.rollback()
+            # Record failure in circuit breaker
+            await circuit_breaker._handle_failure(e)
+            raise
         except Exception as e:
-            # This will handle connection errors and circuit breaker errors
-            # but let them propagate up to the caller
+            logger.exception("Unexpected error during database session")
+            await session.rollback()
             raise
+        
+        await circuit_breaker._handle_success()
 
 
 def db_circuit_breaker(func):
@@ -5,7 +5,7 @@ with proper lifecycle management, error handling, and transaction support.
 It includes dependency injection patterns optimized for FastAPI.
 """
 
-from typing import AsyncGenerator, Callable, Optional, TypeVar, Any, Dict, List
+from typing import AsyncContextManager, AsyncGenerator, Callable, Optional, TypeVar, Any, Dict, List
 import logging
 import inspect
 from contextlib import asynccontextmanager
@@ -15,7 +15,7 @@ from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 
-from app.db.base import async_session_factory, get_session
+from app.db.base import get_session
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +53,30 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
 
 
+async def get_db_session_factory() -> Callable[[], AsyncContextManager[AsyncSession]]:
+    """FastAPI dependency returning a factory for lazily opened sessions.
+    
+    Unlike get_db, nothing is created up front: the handler enters the
+    returned context manager only on code paths that actually need the
+    database, e.g. after a cache miss.
+    
+    Returns:
+        Callable: A zero-argument callable returning an async session context manager.
+    
+    Example:
+        ```python
+        @router.get("/items/{item_id}")
+        async def get_item(item_id: int, db_factory=Depends(get_db_session_factory)):
+            cached = await cache.get(item_id)
+            if cached is None:
+                async with db_factory() as db:
+                    cached = await repository.get_by_id(db, item_id)
+            return cached
+        ```
+    """
+    return get_session
+
+
 def db_transaction(db_param_name: Optional[str] = None) -> Callable:
     """Decorator to wrap functions in a database transaction.
     
@@ -132,37 +156,34 @@ def db_transaction(db_param_name: Optional[str] = None) -> Callable:
                 f"Available parameters: {param_info}"
             )
         
+        def scan_for_session(args, kwargs):
+            # Search args and kwargs by type
+            for arg in args:
+                if isinstance(arg, AsyncSession):
+                    return arg
+            for value in kwargs.values():
+                if isinstance(value, AsyncSession):
+                    return value
+            return None
+        
+        # Pick how to find the session once, so calls only pay for the lookup they need
+        if db_param_pos is not None:
+            def find_session(args, kwargs):
+                # FastAPI passes arguments by keyword, direct calls usually positionally
+                if len(args) > db_param_pos:
+                    session = args[db_param_pos]
+                else:
+                    session = kwargs.get(db_param_key)
+                if session is not None:
+                    return session
+                # Not where the signature says, e.g. a wrapped or partial call
+                return scan_for_session(args, kwargs)
+        else:
+            find_session = scan_for_session
+        
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            # Strategy to find the database session:
-            # 1. Try to find it via the predetermined position in args
-            # 2. Try to find it via the predetermined key in kwargs
-            # 3. Fall back to searching through args and kwargs by type
-            
-            db = None
-            
-            # 1. Check if the db parameter is in args at the predetermined position
-            if db_param_pos is not None and len(args) > db_param_pos:
-                db = args[db_param_pos]
-            
-            # 2. Check if the db parameter is in kwargs with the predetermined key
-            elif db_param_key is not None and db_param_key in kwargs:
-                db = kwargs[db_param_key]
-            
-            # 3. Fallback: search for any AsyncSession in args or kwargs
-            else:
-                # Search in args
-                for arg in args:
-                    if isinstance(arg, AsyncSession):
-                        db = arg
-                        break
-                
-                # Search in kwargs
-                if db is None:
-                    for key, value in kwargs.items():
-                        if isinstance(value, AsyncSession):
-                            db = value
-                            break
+            db = find_session(args, kwargs)
             
             # If no database session is found, raise an error
             if db is None:
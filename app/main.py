@@ -4,7 +4,6 @@ This module initializes the FastAPI application, includes routes,
 and configures middleware and exception handlers.
 """
 
-import os
 import sys
 import time
 import asyncio
@@ -43,8 +42,8 @@ from app.core.rate_limit import (
 from app.scheduler import SchedulerService
 from app.scheduler.scheduler import scheduler_service
 
-# Ensure logs directory exists
-os.makedirs(settings.LOG_DIR, exist_ok=True)
+# Click tracking buffer
+from app.services.click_buffer import click_buffer
 
 # Setup logging
 logger = setup_logging()
@@ -72,7 +71,7 @@ app = FastAPI(
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
+    allow_origins=settings.CORS_ORIGINS_LIST,
     allow_methods=["*"],
     allow_headers=["*"],
 )
@@ -205,9 +204,13 @@ async def startup_event():
     logger.debug(
         "Rate limit configuration", 
         enabled=settings.RATE_LIMIT_ENABLED,
-        admin_ips=getattr(settings, "RATE_LIMIT_ADMIN_IPS", [])
+        admin_ips=settings.RATE_LIMIT_ADMIN_IPS_LIST
     )
     
+    # Start the click buffer consumer
+    click_buffer.start()
+    logger.info("Click buffer started")
+    
     # Initialize and start the scheduler
     try:
         logger.info("Initializing scheduler")
@@ -226,9 +229,28 @@ async def shutdown_event():
     from app.core.rate_limit.middleware import close_rate_limiting
     await close_rate_limiting()
     
+    # Flush clicks still waiting in the buffer and persist pending counters
+    try:
+        await click_buffer.stop()
+        await click_buffer.sync_click_counts()
+        logger.info("Click buffer flushed")
+    except Exception as e:
+        logger.error(f"Error flushing click buffer: {e}")
+    
+    # Close the health probe database connection
+    from app.db.base import database_probe
+    await database_probe.close()
+    
     # Shutdown the scheduler
     try:
         scheduler_service.shutdown()
         logger.info("Scheduler shut down successfully")
     except Exception as e:
         logger.error(f"Error shutting down scheduler: {e}")
+    
+    # Write URL access records still in the buffer
+    from app.core.url_logger import close_url_logging
+    await close_url_logging()
+    
+    # Wait for enqueued log records to be written
+    await logger.complete()
@@ -6,16 +6,15 @@ by using Redis as a message queue and batch processing with Loguru.
 """
 
 import asyncio
-import json
 import time
 import uuid
 from contextvars import ContextVar
 from typing import Dict, Optional, Any, List, Callable, Union, Tuple
 
-from fastapi import Request, Response
+import orjson
 from loguru import logger
 from redis.exceptions import RedisError
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
 from starlette.types import ASGIApp, Scope, Receive, Send, Message
 
 from app.core.config import settings
@@ -27,14 +26,25 @@ request_id_var: ContextVar[str] = ContextVar("request_id", default="")
 # Background tasks
 _bg_tasks: Dict[str, asyncio.Task] = {}
 
+# Matches the REQUEST level registered in setup_logging
+_REQUEST_LEVEL_NO = 25
+_REQUEST_LOG_FORMAT = "{method} {path} {status_code} {process_time_ms}ms {client_ip} {request_id}"
+
+# Log records waiting to be published to Redis in batches
+_publish_queue: asyncio.Queue = asyncio.Queue(maxsize=50000)
+
 # In-memory fallback queue for when Redis is not available
 _fallback_queue: asyncio.Queue = asyncio.Queue(maxsize=10000)
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+class LoggingMiddleware:
     """
     Non-blocking logging middleware using Redis as a message queue.
     
+    Implemented as a plain ASGI middleware: the response is passed through
+    as it is sent, only the start message is inspected for the status code
+    and to add the X-Request-ID header.
+    
     Features:
     - Zero impact on request latency
     - Completely non-blocking log publishing
@@ -45,90 +55,77 @@ class LoggingMiddleware(BaseHTTPMiddleware):
     
     def __init__(self, app: ASGIApp):
         """Initialize the middleware and ensure background tasks are started."""
-        super().__init__(app)
+        self.app = app
         
         # Start background processor tasks if not already running
         self._ensure_background_tasks()
     
-    async def dispatch(self, request: Request, call_next) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Process the request and log metrics in a completely non-blocking manner.
         """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
         # Generate unique request ID and set it in context
         request_id = str(uuid.uuid4())
         request_id_var.set(request_id)
+        status_code = 500
+        
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add request ID to response headers for traceability
+                message.setdefault("headers", [])
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
         
         # Start timing the request
-        start_time = time.time()
+        start_time = time.monotonic()
         
         # Process the request
-        response = await call_next(request)
-        
-        # Add request ID to response headers for traceability
-        response.headers["X-Request-ID"] = request_id
+        await self.app(scope, receive, send_with_request_id)
         
         # Calculate request processing time
-        process_time = time.time() - start_time
+        process_time = time.monotonic() - start_time
         
         # Get client IP with forwarded headers consideration
-        client_ip = request.client.host if request.client else "unknown"
-        if "X-Forwarded-For" in request.headers:
-            forwarded_ips = request.headers["X-Forwarded-For"].split(",")
-            if forwarded_ips:
-                client_ip = forwarded_ips[0].strip()
+        forwarded_for = Headers(scope=scope).get("x-forwarded-for")
+        if forwarded_for:
+            client_ip = forwarded_for.partition(",")[0].strip()
+        else:
+            client = scope.get("client")
+            client_ip = client[0] if client else "unknown"
         
         # Create the log record with all required information
         log_record = {
             "timestamp": time.time(),
             "request_id": request_id,
             "client_ip": client_ip,
-            "method": request.method,
-            "path": request.url.path,
-            "status_code": response.status_code,
+            "method": scope["method"],
+            "path": scope["path"],
+            "status_code": status_code,
             "process_time_ms": round(process_time * 1000, 2)
         }
         
         # Add query params if present
-        if request.query_params:
-            log_record["query_params"] = dict(request.query_params)
+        if scope["query_string"]:
+            log_record["query_params"] = dict(QueryParams(scope["query_string"]))
         
-        # Asynchronously publish the log record without blocking
-        asyncio.create_task(self._publish_log_record(log_record))
-        
-        return response
-    
-    async def _publish_log_record(self, log_record: Dict[str, Any]) -> None:
-        """
-        Non-blocking function to publish log record to Redis.
-        
-        Falls back to local queue if Redis is unavailable.
-        """
+        # Hand the record to the batch publisher without creating a task
         try:
-            if not settings.REDIS_LOGGING_ENABLED:
-                # If Redis logging is disabled, log directly to Loguru
-                logger.log("REQUEST", "{method} {path} {status_code} {process_time_ms}ms", **log_record)
-                return
-                
-            # Try to publish to Redis queue first
-            redis_client = await redis_manager.get_client()
-            await redis_client.lpush(
-                settings.REDIS_LOGGING_QUEUE,
-                json.dumps(log_record)
-            )
-        except (RedisError, ConnectionError) as e:
-            # If Redis fails, use fallback queue
-            if settings.REDIS_LOGGING_FALLBACK_LOCAL:
-                try:
-                    _fallback_queue.put_nowait(log_record)
-                except asyncio.QueueFull:
-                    # Fallback queue is full, log the error but don't block request
-                    logger.warning(f"Fallback log queue full, dropping log: {log_record['request_id']}")
-            else:
-                # Log the error but continue processing the request
-                logger.error(f"Failed to publish log record to Redis: {str(e)}")
+            _publish_queue.put_nowait(log_record)
+        except asyncio.QueueFull:
+            _store_in_fallback(log_record)
     
     def _ensure_background_tasks(self) -> None:
         """Ensure all required background tasks are running."""
+        # Batch publisher task
+        if "log_publisher" not in _bg_tasks or _bg_tasks["log_publisher"].done():
+            _bg_tasks["log_publisher"] = asyncio.create_task(publish_log_records())
+        
         # Log consumer task
         if "log_consumer" not in _bg_tasks or _bg_tasks["log_consumer"].done():
             _bg_tasks["log_consumer"] = asyncio.create_task(process_logs_from_redis())
@@ -142,6 +139,65 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             _bg_tasks["redis_health"] = asyncio.create_task(monitor_redis_health())
 
 
+def _store_in_fallback(log_record: Dict[str, Any]) -> None:
+    """Keep a log record in the local fallback queue, dropping it if that is full."""
+    try:
+        _fallback_queue.put_nowait(log_record)
+    except asyncio.QueueFull:
+        # Fallback queue is full, log the error but don't block request
+        logger.warning(f"Fallback log queue full, dropping log: {log_record['request_id']}")
+
+
+async def publish_log_records() -> None:
+    """
+    Background task that publishes queued log records to Redis.
+    
+    Records queued by the middleware are sent in batches of up to
+    REDIS_LOGGING_BATCH_SIZE with a single LPUSH. Batches that cannot be
+    published go to the local fallback queue.
+    """
+    batch_size = settings.REDIS_LOGGING_BATCH_SIZE
+    
+    # Client reused across batches; dropped after an error so it is re-fetched
+    redis_client = None
+    
+    logger.info(f"Starting Redis log publisher (batch size: {batch_size})")
+    
+    try:
+        while True:
+            batch = [await _publish_queue.get()]
+            while len(batch) < batch_size:
+                try:
+                    batch.append(_publish_queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            
+            if not settings.REDIS_LOGGING_ENABLED:
+                # If Redis logging is disabled, log directly to Loguru
+                await flush_log_batch(batch)
+                continue
+            
+            try:
+                if redis_client is None:
+                    redis_client = await redis_manager.get_client()
+                # One variadic LPUSH keeps the records in order, like separate pushes
+                await redis_client.lpush(
+                    settings.REDIS_LOGGING_QUEUE,
+                    *[orjson.dumps(log_record) for log_record in batch]
+                )
+            except (RedisError, ConnectionError) as e:
+                redis_client = None
+                if settings.REDIS_LOGGING_FALLBACK_LOCAL:
+                    for log_record in batch:
+                        _store_in_fallback(log_record)
+                else:
+                    # Log the error but keep publishing later records
+                    logger.error(f"Failed to publish {len(batch)} log records to Redis: {str(e)}")
+    except asyncio.CancelledError:
+        logger.info("Redis log publisher stopped")
+        raise
+
+
 async def process_logs_from_redis() -> None:
     """
     Background task that processes logs from Redis.
@@ -153,56 +209,62 @@ async def process_logs_from_redis() -> None:
     """
     batch_size = settings.REDIS_LOGGING_BATCH_SIZE
     flush_interval = settings.REDIS_LOGGING_FLUSH_INTERVAL
-    last_flush_time = time.time()
+    last_flush_time = time.monotonic()
     log_batch: List[Dict[str, Any]] = []
     
+    # Client reused across iterations; dropped after an error so it is re-fetched
+    redis_client = None
+    
     logger.info(f"Starting Redis log consumer (batch size: {batch_size}, flush interval: {flush_interval}s)")
     
     try:
         while True:
             try:
-                # Check if Redis is available
-                if not await redis_manager.is_connected():
-                    await asyncio.sleep(1.0)
-                    continue
-                
-                # Get Redis client
-                redis_client = await redis_manager.get_client()
+                if redis_client is None:
+                    # Check if Redis is available
+                    if not await redis_manager.is_connected():
+                        await asyncio.sleep(1.0)
+                        continue
+                    redis_client = await redis_manager.get_client()
                 
                 # Determine how many logs to fetch based on batch size
                 remaining_capacity = batch_size - len(log_batch)
                 
                 # Pop multiple items from Redis at once (more efficient)
                 if remaining_capacity > 0:
-                    # Use RPOP to get logs in FIFO order
-                    raw_logs = await redis_client.rpop(
-                        settings.REDIS_LOGGING_QUEUE, 
+                    # Block in Redis until logs arrive or the next flush is due;
+                    # popping from the right returns them in FIFO order
+                    wait_time = max(0.01, flush_interval - (time.monotonic() - last_flush_time))
+                    popped = await redis_client.blmpop(
+                        wait_time,
+                        1,
+                        settings.REDIS_LOGGING_QUEUE,
+                        direction="RIGHT",
                         count=remaining_capacity
                     )
+                    raw_logs = popped[1] if popped else None
                     
                     if raw_logs:
                         # Parse logs and add to batch
                         for raw_log in raw_logs:
                             try:
-                                log_record = json.loads(raw_log)
+                                log_record = orjson.loads(raw_log)
                                 log_batch.append(log_record)
-                            except json.JSONDecodeError:
+                            except orjson.JSONDecodeError:
                                 logger.error(f"Failed to parse log record: {raw_log}")
                 
                 # Check if we should flush based on batch size or time
-                time_since_flush = time.time() - last_flush_time
+                time_since_flush = time.monotonic() - last_flush_time
                 should_flush = (len(log_batch) >= batch_size) or (time_since_flush >= flush_interval and log_batch)
                 
                 if should_flush:
                     await flush_log_batch(log_batch)
                     log_batch = []
-                    last_flush_time = time.time()
-                
-                # Small delay to prevent CPU spinning
-                await asyncio.sleep(0.01)
+                    last_flush_time = time.monotonic()
                 
             except RedisError as e:
                 logger.error(f"Redis error in log consumer: {str(e)}")
+                redis_client = None
                 # Flush any pending logs 
                 if log_batch:
                     await flush_log_batch(log_batch)
@@ -212,6 +274,7 @@ async def process_logs_from_redis() -> None:
                 await asyncio.sleep(1.0)
             except Exception as e:
                 logger.error(f"Error in Redis log consumer: {str(e)}")
+                redis_client = None
                 # Don't lose logs in case of error
                 if log_batch:
                     await flush_log_batch(log_batch)
@@ -235,7 +298,7 @@ async def process_fallback_queue() -> None:
     """
     batch_size = settings.REDIS_LOGGING_BATCH_SIZE
     flush_interval = settings.REDIS_LOGGING_FLUSH_INTERVAL
-    last_flush_time = time.time()
+    last_flush_time = time.monotonic()
     log_batch: List[Dict[str, Any]] = []
     
     logger.info(f"Starting fallback log processor")
@@ -246,7 +309,7 @@ async def process_fallback_queue() -> None:
                 # Try to get logs from the fallback queue
                 try:
                     # Determine timeout based on remaining flush interval
-                    wait_time = max(0.01, flush_interval - (time.time() - last_flush_time))
+                    wait_time = max(0.01, flush_interval - (time.monotonic() - last_flush_time))
                     log_record = await asyncio.wait_for(_fallback_queue.get(), timeout=wait_time)
                     log_batch.append(log_record)
                     _fallback_queue.task_done()
@@ -255,13 +318,13 @@ async def process_fallback_queue() -> None:
                     pass
                 
                 # Check if we should flush based on batch size or time
-                time_since_flush = time.time() - last_flush_time
+                time_since_flush = time.monotonic() - last_flush_time
                 should_flush = (len(log_batch) >= batch_size) or (time_since_flush >= flush_interval and log_batch)
                 
                 if should_flush:
                     await flush_log_batch(log_batch)
                     log_batch = []
-                    last_flush_time = time.time()
+                    last_flush_time = time.monotonic()
                 
                 # Try to move logs back to Redis if it's available
                 if not _fallback_queue.empty() and await redis_manager.is_connected():
@@ -300,20 +363,19 @@ async def _migrate_fallback_to_redis() -> None:
         if batch_size > 0:
             logger.info(f"Migrating {batch_size} logs from fallback queue to Redis")
             
-            # Create a pipeline for efficiency
-            pipeline = redis_client.pipeline()
-            
-            # Process up to batch_size items
+            # Collect up to batch_size items
+            values = []
             for _ in range(batch_size):
                 try:
                     log_record = _fallback_queue.get_nowait()
-                    pipeline.lpush(settings.REDIS_LOGGING_QUEUE, json.dumps(log_record))
+                    values.append(orjson.dumps(log_record))
                     _fallback_queue.task_done()
                 except asyncio.QueueEmpty:
                     break
             
-            # Execute the pipeline
-            await pipeline.execute()
+            # Push them with a single command
+            if values:
+                await redis_client.lpush(settings.REDIS_LOGGING_QUEUE, *values)
             
             logger.info(f"Successfully migrated logs to Redis")
     except (RedisError, ConnectionError) as e:
@@ -351,9 +413,15 @@ async def flush_log_batch(batch: List[Dict[str, Any]]) -> None:
     """
     Flush a batch of logs to Loguru for file output.
     
+    Each request stays its own Loguru record so the JSON sink keeps its
+    fields; the whole batch is skipped when REQUEST records are filtered out.
+    
     Args:
         batch: List of log records to flush
     """
+    if logger._core.min_level > _REQUEST_LEVEL_NO:
+        return
+    
     try:
         # Process each log record
         for record in batch:
@@ -368,7 +436,7 @@ async def flush_log_batch(batch: List[Dict[str, Any]]) -> None:
             # Log to Loguru with REQUEST level
             logger.log(
                 "REQUEST",
-                "{method} {path} {status_code} {process_time_ms}ms {client_ip} {request_id}",
+                _REQUEST_LOG_FORMAT,
                 method=method,
                 path=path,
                 status_code=status_code,
@@ -416,6 +484,13 @@ def add_logging_middleware(app) -> None:
                 except asyncio.CancelledError:
                     pass
         
+        # Write records that were never published straight to Loguru
+        if not _publish_queue.empty():
+            pending = []
+            while not _publish_queue.empty():
+                pending.append(_publish_queue.get_nowait())
+            await flush_log_batch(pending)
+        
         # Wait for fallback queue to be processed
         if not _fallback_queue.empty():
             logger.info(f"Processing {_fallback_queue.qsize()} remaining logs in fallback queue")
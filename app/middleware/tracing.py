@@ -1,10 +1,8 @@
 """Custom tracing middleware for URL Shortener application."""
 
 import time
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
-from starlette.responses import Response
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from opentelemetry import trace
 from opentelemetry.trace import SpanKind
@@ -28,30 +26,47 @@ request_duration = meter.create_histogram(
 )
 
 
-class TracingMiddleware(BaseHTTPMiddleware):
-    """Middleware that adds custom spans and metrics for each request."""
+class TracingMiddleware:
+    """Middleware that adds custom spans and metrics for each request.
+    
+    Implemented as a plain ASGI middleware, so responses stream through
+    unchanged; the status code is read from the response start message.
+    """
 
     def __init__(self, app: ASGIApp) -> None:
         """Initialize the middleware."""
-        super().__init__(app)
+        self.app = app
 
-    async def dispatch(self, request: Request, call_next) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process the request and add tracing/metrics."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
         # Record start time
-        start_time = time.time()
+        start_time = time.monotonic()
         
         # Extract path for use in span and metrics
-        path = request.url.path
-        method = request.method
+        path = scope["path"]
+        method = scope["method"]
+        headers = Headers(scope=scope)
         
         # Create attributes for span and metrics
         attributes = {
             "http.method": method,
             "http.path": path,
-            "http.flavor": request.scope.get("http_version", ""),
-            "http.host": request.headers.get("host", ""),
-            "http.user_agent": request.headers.get("user-agent", ""),
+            "http.flavor": scope.get("http_version", ""),
+            "http.host": headers.get("host", ""),
+            "http.user_agent": headers.get("user-agent", ""),
         }
+        status_code = 500
+        
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
         # Add custom span for the request processing
         with tracer.start_as_current_span(
             f"{method} {path}",
@@ -59,14 +74,12 @@ class TracingMiddleware(BaseHTTPMiddleware):
             kind=SpanKind.SERVER,
         ):
             # Process the request through the next handler
-            response = await call_next(request)
+            await self.app(scope, receive, send_with_status)
             
             # Add status code to attributes
-            attributes["http.status_code"] = response.status_code
+            attributes["http.status_code"] = status_code
             
             # Record metrics
-            duration_ms = (time.time() - start_time) * 1000
+            duration_ms = (time.monotonic() - start_time) * 1000
             request_counter.add(1, attributes)
             request_duration.record(duration_ms, attributes)
-            
-            return response 
\ No newline at end of file
@@ -20,6 +20,7 @@ from app.core.config import settings
 from app.db.base import get_session
 from app.services.cleanup import CleanupService
 from app.repositories.url_repository import URLRepository
+from app.services.click_buffer import click_buffer
 
 # No longer using Redis-based log processing
 # Logging is now handled by Loguru directly
@@ -81,6 +82,27 @@ async def cleanup_expired_urls_job():
         }
 
 
+# Standalone function for click count reconciliation job
+async def sync_click_counts_job():
+    """
+    Job to move click counts accumulated in Redis into the database.
+    
+    This is a standalone function that gets scheduled.
+    """
+    try:
+        synced = await click_buffer.sync_click_counts()
+        if synced:
+            logger.info(f"Synced {synced} buffered clicks to the database")
+        return {"synced": synced}
+    except Exception as e:
+        logger.error(f"Error in scheduled click count sync job: {e}", exc_info=True)
+        return {
+            "status": "error",
+            "error": str(e),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+
 class SchedulerService:
     """
     Scheduler service for managing background tasks.
@@ -160,6 +182,26 @@ class SchedulerService:
                 'function': 'cleanup_expired_urls_job'
             })
 
+            # Add click count sync job
+            if settings.CLICK_COUNTER_REDIS_ENABLED:
+                self.scheduler.add_job(
+                    sync_click_counts_job,
+                    trigger=IntervalTrigger(
+                        seconds=settings.CLICK_COUNT_SYNC_INTERVAL_SECONDS,
+                        timezone='UTC'
+                    ),
+                    id='sync_click_counts',
+                    name='Sync Click Counts',
+                    replace_existing=True
+                )
+                
+                self.jobs.append({
+                    'id': 'sync_click_counts',
+                    'name': 'Sync Click Counts',
+                    'interval': f'{settings.CLICK_COUNT_SYNC_INTERVAL_SECONDS} seconds',
+                    'function': 'sync_click_counts_job'
+                })
+
             # Log processing job removed - now using Loguru's built-in async capabilities
             
             self.scheduler.start()
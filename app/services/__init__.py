@@ -7,5 +7,6 @@ Services orchestrate interactions between repositories and provide domain-specif
 from app.services.shortener import ShortenedURLService
 from app.services.stats import StatsService
 from app.services.cleanup import CleanupService
+from app.services.click_buffer import ClickBuffer
 
-__all__ = ["ShortenedURLService", "StatsService", "CleanupService"]
\ No newline at end of file
+__all__ = ["ShortenedURLService", "StatsService", "CleanupService", "ClickBuffer"]
\ No newline at end of file
@@ -0,0 +1,449 @@
+"""Click buffering for the URL shortener application.
+
+This module contains the ClickBuffer class which collects click events from the
+redirect path in memory and writes them to the database in batches, so a
+redirect never has to open its own session or transaction. When a Redis stream
+is configured, batches are published to the stream instead and a consumer group
+writes them to the database, so clicks outlive the process that received them.
+Per-URL click counters are accumulated in Redis and reconciled into the database
+periodically.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from redis.exceptions import RedisError, ResponseError
+
+from app.core.config import settings
+from app.core.redis import redis_manager
+from app.db.session import SessionManager
+from app.repositories.stats_repository import StatsRepository
+from app.repositories.url_repository import URLRepository
+from app.services.stats import StatsService
+
+logger = logging.getLogger(__name__)
+
+# Queued by stop() so the consumer finishes its current batch and exits
+_STOP = object()
+
+
+class ClickBuffer:
+    """
+    In-memory buffer that batches click events before persisting them.
+
+    Click events are queued without awaiting anything and a single background
+    consumer flushes them through StatsService.track_clicks_batch, either when
+    a batch fills up or when the flush interval elapses. When a counter key is
+    configured, click counts go to a Redis hash with one pipelined HINCRBY per
+    batch instead of an UPDATE per URL, and sync_click_counts moves them into
+    the database in bulk. When a stream key is configured, each batch is
+    published with one pipelined XADD round trip and a second consumer reads
+    the stream through a consumer group, acknowledging entries only after they
+    are stored.
+    """
+
+    def __init__(
+        self,
+        stats_service: StatsService,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_size: int = 10000,
+        counter_key: Optional[str] = None,
+        stream_key: Optional[str] = None,
+        stream_group: str = "click-writers",
+        stream_maxlen: int = 100000,
+        stream_claim_idle: float = 60.0
+    ):
+        """
+        Initialize the click buffer.
+
+        Args:
+            stats_service: Service used to persist click batches
+            batch_size: Maximum number of clicks written per transaction
+            flush_interval: Maximum seconds a click waits before being written
+            max_size: Maximum number of queued clicks before new ones are dropped
+            counter_key: Redis hash holding pending click counts per URL ID,
+                or None to update counts in the database directly
+            stream_key: Redis stream that click batches are published to,
+                or None to write batches to the database directly
+            stream_group: Consumer group that writes stream entries to the database
+            stream_maxlen: Approximate number of entries the stream is trimmed to
+            stream_claim_idle: Seconds an entry can stay unacknowledged by another
+                consumer before this one claims it
+        """
+        self.stats_service = stats_service
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.counter_key = counter_key
+        self.stream_key = stream_key
+        self.stream_group = stream_group
+        self.stream_maxlen = stream_maxlen
+        self.stream_claim_idle = stream_claim_idle
+        self._consumer_name = f"{socket.gethostname()}-{os.getpid()}"
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self._task: Optional[asyncio.Task] = None
+        self._stream_task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+    
+    @property
+    def _use_stream(self) -> bool:
+        return self.stream_key is not None and redis_manager.is_enabled
+
+    def add(
+        self,
+        short_code: str,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None
+    ) -> None:
+        """
+        Queue a click event for the next batch.
+
+        Only enqueues; the consumers are started once by the application
+        lifespan, so the redirect path does no task bookkeeping.
+
+        Args:
+            short_code: Short code that was clicked
+            ip_address: Client IP address
+            user_agent: Client user agent string
+        """
+        try:
+            self._queue.put_nowait({
+                "short_code": short_code,
+                "ip_address": ip_address,
+                "user_agent": user_agent,
+                "clicked_at": datetime.utcnow(),
+            })
+        except asyncio.QueueFull:
+            # Never block a redirect on analytics
+            logger.warning(f"Click buffer full, dropping click for '{short_code}'")
+
+    def start(self) -> None:
+        """
+        Start the background consumers if they are not already running.
+
+        Does nothing once stop() has been called, so a late caller cannot
+        spawn consumers that nothing would stop.
+        """
+        if self._stopping.is_set():
+            logger.warning("Click buffer is stopping, not starting consumers")
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._consume())
+        if self._use_stream and (self._stream_task is None or self._stream_task.done()):
+            self._stream_task = asyncio.create_task(self._consume_stream())
+
+    async def stop(self) -> None:
+        """
+        Stop the background consumers and write any queued clicks.
+
+        The consumers are not cancelled: each one finishes the batch it is
+        writing, so clicks already taken off the queue or read from the
+        stream are stored before this returns. Clicks added while this runs
+        are written by the final drain.
+        """
+        self._stopping.set()
+        if self._task is not None and not self._task.done():
+            # Waits for room if the queue is full; the consumer is draining it
+            await self._queue.put(_STOP)
+        for task in (self._task, self._stream_task):
+            if task is not None:
+                await asyncio.gather(task, return_exceptions=True)
+        self._task = None
+        self._stream_task = None
+
+        # Nothing reads the stream any more, so go straight to the database
+        while not self._queue.empty():
+            await self._persist(self._drain(self.batch_size))
+
+    def _drain(self, limit: int) -> List[Dict[str, Any]]:
+        """Take up to ``limit`` queued clicks without waiting."""
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _consume(self) -> None:
+        """Collect clicks into batches and flush them until stop() is called."""
+        logger.info(
+            f"Starting click buffer consumer (batch size: {self.batch_size}, "
+            f"flush interval: {self.flush_interval}s)"
+        )
+        stopping = False
+        while not stopping:
+            click = await self._queue.get()
+            if click is _STOP:
+                break
+            batch = [click]
+            deadline = time.monotonic() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                batch.extend(self._drain(self.batch_size - len(batch)))
+                if _STOP in batch:
+                    batch.remove(_STOP)
+                    stopping = True
+                    break
+                remaining = deadline - time.monotonic()
+                if len(batch) >= self.batch_size or remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        """Hand a batch of clicks to the stream, or persist it if that fails."""
+        if not batch:
+            return
+        if self._use_stream:
+            try:
+                await self._publish(batch)
+                return
+            except (RedisError, ConnectionError) as e:
+                logger.warning(f"Click stream unavailable, writing {len(batch)} clicks directly: {e}")
+        await self._persist(batch)
+
+    async def _publish(self, batch: List[Dict[str, Any]]) -> None:
+        """Append a batch of clicks to the stream in a single round trip."""
+        client = await redis_manager.get_client()
+        pipeline = client.pipeline(transaction=False)
+        for click in batch:
+            pipeline.xadd(
+                self.stream_key,
+                {
+                    "c": click["short_code"],
+                    "ip": click["ip_address"] or "",
+                    "ua": click["user_agent"] or "",
+                    "t": click["clicked_at"].isoformat(),
+                },
+                maxlen=self.stream_maxlen,
+                approximate=True
+            )
+        await pipeline.execute()
+
+    async def _consume_stream(self) -> None:
+        """Read clicks from the stream through the consumer group until stop() is called."""
+        logger.info(
+            f"Starting click stream consumer '{self._consumer_name}' "
+            f"(stream: {self.stream_key}, group: {self.stream_group})"
+        )
+        # Start with entries this consumer read but never acknowledged
+        last_id = "0"
+        next_claim = time.monotonic()
+        while not self._stopping.is_set():
+            try:
+                client = await redis_manager.get_client()
+                if last_id == "0":
+                    await self._ensure_stream_group(client)
+                if time.monotonic() >= next_claim:
+                    next_claim = time.monotonic() + self.stream_claim_idle
+                    if await self._claim_stale_entries(client):
+                        last_id = "0"
+                response = await client.xreadgroup(
+                    self.stream_group,
+                    self._consumer_name,
+                    {self.stream_key: last_id},
+                    count=self.batch_size,
+                    block=int(self.flush_interval * 1000)
+                )
+            except (RedisError, ConnectionError) as e:
+                logger.warning(f"Error reading click stream: {e}")
+                await self._wait_stopping(self.flush_interval)
+                continue
+
+            entries = response[0][1] if response else []
+            if not entries:
+                # Pending entries are exhausted, switch to new ones
+                last_id = ">"
+                continue
+
+            entry_ids = [entry_id for entry_id, _ in entries]
+            batch = self._parse_stream_entries(entries)
+            if not await self._persist(batch):
+                # Leave them pending and retry from the start of the backlog
+                last_id = "0"
+                await self._wait_stopping(self.flush_interval)
+                continue
+
+            try:
+                await client.xack(self.stream_key, self.stream_group, *entry_ids)
+            except (RedisError, ConnectionError) as e:
+                logger.warning(f"Error acknowledging {len(entry_ids)} click stream entries: {e}")
+
+    async def _claim_stale_entries(self, client) -> int:
+        """
+        Take over entries left unacknowledged by other consumers.
+
+        Consumer names include the process ID, so entries delivered to a
+        process that exited are never read again under its name. Claiming
+        them adds them to this consumer's pending entries.
+
+        Returns:
+            int: Number of entries claimed
+        """
+        min_idle_time = int(self.stream_claim_idle * 1000)
+        cursor = "0-0"
+        claimed = 0
+        while True:
+            response = await client.xautoclaim(
+                self.stream_key,
+                self.stream_group,
+                self._consumer_name,
+                min_idle_time,
+                start_id=cursor,
+                count=self.batch_size
+            )
+            cursor, entries = response[0], response[1]
+            claimed += len(entries)
+            if cursor in (b"0-0", "0-0"):
+                break
+        if claimed:
+            logger.info(f"Claimed {claimed} stale click stream entries")
+        return claimed
+
+    async def _wait_stopping(self, timeout: float) -> None:
+        """Sleep for ``timeout`` seconds, returning early if stop() is called."""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _ensure_stream_group(self, client) -> None:
+        """Create the consumer group and the stream if they do not exist."""
+        try:
+            await client.xgroup_create(self.stream_key, self.stream_group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def _parse_stream_entries(self, entries: List[Any]) -> List[Dict[str, Any]]:
+        """
+        Convert stream entries into click events, skipping unusable ones.
+
+        Skipped entries are still acknowledged with the rest of the batch,
+        so a malformed entry is dropped once instead of being redelivered
+        on every read.
+        """
+        batch = []
+        for entry_id, fields in entries:
+            # Pending entries trimmed from the stream come back without fields
+            if not fields:
+                continue
+            try:
+                batch.append(self._parse_stream_entry(fields))
+            except (KeyError, ValueError) as e:
+                logger.error(f"Dropping malformed click stream entry {entry_id!r} {fields!r}: {e}")
+        return batch
+
+    @staticmethod
+    def _parse_stream_entry(fields: Dict[bytes, bytes]) -> Dict[str, Any]:
+        """Convert raw stream entry fields back into a click event."""
+        ip_address = fields.get(b"ip")
+        user_agent = fields.get(b"ua")
+        return {
+            "short_code": fields[b"c"].decode(),
+            "ip_address": ip_address.decode() if ip_address else None,
+            "user_agent": user_agent.decode() if user_agent else None,
+            "clicked_at": datetime.fromisoformat(fields[b"t"].decode()),
+        }
+
+    async def _persist(self, batch: List[Dict[str, Any]]) -> bool:
+        """
+        Persist a batch of clicks in a single transaction.
+
+        Returns:
+            bool: True if the clicks were stored
+        """
+        if not batch:
+            return True
+        use_counters = self.counter_key is not None and redis_manager.is_enabled
+        try:
+            async with SessionManager.transaction_context() as db:
+                click_counts = await self.stats_service.track_clicks_batch(
+                    db, batch, increment_counts=not use_counters
+                )
+        except Exception as e:
+            # Log but keep the consumer alive
+            logger.error(f"Error flushing {len(batch)} buffered clicks: {e}")
+            return False
+
+        if use_counters and click_counts:
+            try:
+                await self._increment_counters(click_counts)
+            except (RedisError, ConnectionError) as e:
+                logger.warning(f"Redis click counters unavailable, updating database directly: {e}")
+                await self._apply_click_counts(click_counts)
+        return True
+
+    async def _increment_counters(self, click_counts: Dict[int, int]) -> None:
+        """Add click counts to the Redis hash in a single round trip."""
+        client = await redis_manager.get_client()
+        pipeline = client.pipeline(transaction=False)
+        for url_id, count in click_counts.items():
+            pipeline.hincrby(self.counter_key, url_id, count)
+        await pipeline.execute()
+
+    async def _apply_click_counts(self, click_counts: Dict[int, int]) -> None:
+        """Write click counts straight to the database."""
+        try:
+            async with SessionManager.transaction_context() as db:
+                await self.stats_service.apply_click_counts(db, click_counts)
+        except Exception as e:
+            logger.error(f"Error applying click counts for {len(click_counts)} URLs: {e}")
+
+    async def sync_click_counts(self) -> int:
+        """
+        Move pending click counts from Redis into the database.
+
+        The hash is read and deleted atomically, so counts added while the
+        database update runs are kept for the next sync. If the update fails,
+        the counts are added back to Redis.
+
+        Returns:
+            int: Number of clicks applied to the database
+        """
+        if self.counter_key is None or not redis_manager.is_enabled:
+            return 0
+
+        client = await redis_manager.get_client()
+        pipeline = client.pipeline(transaction=True)
+        pipeline.hgetall(self.counter_key)
+        pipeline.delete(self.counter_key)
+        pending, _ = await pipeline.execute()
+        if not pending:
+            return 0
+
+        click_counts = {int(url_id): int(count) for url_id, count in pending.items()}
+        try:
+            async with SessionManager.transaction_context() as db:
+                await self.stats_service.apply_click_counts(db, click_counts)
+        except Exception:
+            await self._increment_counters(click_counts)
+            raise
+        return sum(click_counts.values())
+
+
+# Shared click buffer used by the redirect endpoint
+click_buffer = ClickBuffer(
+    stats_service=StatsService(
+        stats_repository=StatsRepository(),
+        url_repository=URLRepository()
+    ),
+    batch_size=settings.CLICK_BUFFER_BATCH_SIZE,
+    flush_interval=settings.CLICK_BUFFER_FLUSH_INTERVAL,
+    max_size=settings.CLICK_BUFFER_MAX_SIZE,
+    counter_key=settings.CLICK_COUNTER_REDIS_KEY if settings.CLICK_COUNTER_REDIS_ENABLED else None,
+    stream_key=settings.CLICK_STREAM_KEY if settings.CLICK_STREAM_ENABLED else None,
+    stream_group=settings.CLICK_STREAM_GROUP,
+    stream_maxlen=settings.CLICK_STREAM_MAXLEN,
+    stream_claim_idle=settings.CLICK_STREAM_CLAIM_IDLE_SECONDS
+)
@@ -5,12 +5,15 @@ for URL shortening, retrieval, and management.
 """
 
 import logging
+import os
 import random
 import re
 import string
-from datetime import datetime, timedelta
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.url import ShortURL, ShortURLUpdate
@@ -27,10 +30,41 @@ from app.services.exceptions import (
     URLUpdateError,
 )
 from app.core.config import settings
+from app.core.redis import redis_manager
 from app.db.session import db_transaction
 
 logger = logging.getLogger(__name__)
 
+# Redis key prefix for cached short_code -> original_url mappings
+URL_CACHE_KEY_PREFIX = "url:"
+
+
+@lru_cache(maxsize=8)
+def _code_translation(chars: str) -> Optional[Tuple[bytes, bytes]]:
+    """
+    Build a bytes.translate table that maps random bytes onto code characters.
+    
+    Byte values past the largest multiple of len(chars) are deleted rather than
+    wrapped, so every character stays equally likely.
+    
+    Args:
+        chars: Alphabet used for short codes
+        
+    Returns:
+        Tuple of (table, delete) for bytes.translate, or None if the alphabet
+        is not a non-empty ASCII string of at most 256 characters
+    """
+    try:
+        alphabet = chars.encode("ascii")
+    except UnicodeEncodeError:
+        return None
+    if not 0 < len(alphabet) <= 256:
+        return None
+    
+    usable = 256 - 256 % len(alphabet)
+    table = bytes(alphabet[b % len(alphabet)] for b in range(256))
+    return table, bytes(range(usable, 256))
+
 
 class ShortenedURLService:
     """
@@ -169,6 +203,82 @@ class ShortenedURLService:
             logger.error(f"Error retrieving URL by code: {e}")
             raise URLNotFoundError(f"Failed to retrieve URL with code '{short_code}'")
     
+    async def get_cached_redirect(self, short_code: str) -> Optional[Tuple[str, Optional[datetime]]]:
+        """
+        Look up the redirect target for a short code in the Redis cache.
+        
+        Cache errors are treated as misses so redirects keep working
+        when Redis is unavailable.
+        
+        Args:
+            short_code: The short code to look up
+            
+        Returns:
+            Optional[Tuple[str, Optional[datetime]]]: The cached original URL and
+            its expiration (None if it never expires), or None on a miss
+        """
+        if not settings.CACHE_ENABLED:
+            return None
+        try:
+            client = await redis_manager.get_client()
+            cached = await client.get(URL_CACHE_KEY_PREFIX + short_code)
+        except (RedisError, ConnectionError) as e:
+            logger.warning(f"URL cache lookup failed for '{short_code}': {e}")
+            return None
+        if cached is None:
+            return None
+        
+        # Entries are stored as "<expires_at epoch or empty>|<original_url>"
+        expires_ts, separator, original_url = cached.partition(b"|")
+        if not separator:
+            return None
+        expires_at = datetime.utcfromtimestamp(int(expires_ts)) if expires_ts else None
+        return original_url.decode(), expires_at
+    
+    async def cache_url(self, url: ShortURL) -> None:
+        """
+        Store the short code -> original URL mapping in the Redis cache.
+        
+        The entry lives for CACHE_TIMEOUT seconds, or until the URL
+        expires if that comes first.
+        
+        Args:
+            url: The URL to cache
+        """
+        if not settings.CACHE_ENABLED:
+            return
+        ttl = settings.CACHE_TIMEOUT
+        expires_ts = ""
+        if url.expires_at is not None:
+            ttl = min(ttl, int((url.expires_at - datetime.utcnow()).total_seconds()))
+            expires_ts = str(int(url.expires_at.replace(tzinfo=timezone.utc).timestamp()))
+        if ttl <= 0:
+            return
+        try:
+            client = await redis_manager.get_client()
+            await client.set(
+                URL_CACHE_KEY_PREFIX + url.short_code,
+                f"{expires_ts}|{url.original_url}",
+                ex=ttl
+            )
+        except (RedisError, ConnectionError) as e:
+            logger.warning(f"Failed to cache URL '{url.short_code}': {e}")
+    
+    async def invalidate_cached_url(self, short_code: str) -> None:
+        """
+        Remove a short code from the Redis cache.
+        
+        Args:
+            short_code: The short code to evict
+        """
+        if not settings.CACHE_ENABLED:
+            return
+        try:
+            client = await redis_manager.get_client()
+            await client.delete(URL_CACHE_KEY_PREFIX + short_code)
+        except (RedisError, ConnectionError) as e:
+            logger.warning(f"Failed to invalidate cached URL '{short_code}': {e}")
+    
     async def get_url_for_redirect(self, db: AsyncSession, short_code: str) -> Dict[str, Any]:
         """
         Retrieve minimal URL data needed for redirection with optimized query.
@@ -201,7 +311,6 @@ class ShortenedURLService:
             logger.error(f"Error retrieving URL for redirect: {e}")
             raise URLNotFoundError(f"Failed to retrieve URL with code '{short_code}'")
     
-    @db_transaction(db_param_name="db")
     async def update_url(
         self, 
         db: AsyncSession, 
@@ -211,6 +320,10 @@ class ShortenedURLService:
         """
         Update properties of an existing URL.
         
+        The cache entry is evicted after the transaction commits. Evicting
+        it earlier lets a concurrent redirect read the old row and cache it
+        again until CACHE_TIMEOUT.
+        
         Args:
             db: Database session
             short_code: The short code of the URL to update
@@ -224,6 +337,18 @@ class ShortenedURLService:
             URLUpdateError: If the update operation fails
             InvalidURLError: If the updated original_url is invalid
         """
+        updated_url = await self._update_url(db, short_code, update_data)
+        await self.invalidate_cached_url(short_code)
+        return updated_url
+    
+    @db_transaction(db_param_name="db")
+    async def _update_url(
+        self, 
+        db: AsyncSession, 
+        short_code: str, 
+        update_data: Dict[str, Any]
+    ) -> ShortURL:
+        """Apply a URL update in its own transaction."""
         try:
             # Get the URL to update
             url = await self.url_repository.get_by_short_code(db, short_code)
@@ -286,11 +411,12 @@ class ShortenedURLService:
             "time_left_seconds": time_left,
         }
     
-    @db_transaction(db_param_name="db")
     async def delete_url(self, db: AsyncSession, short_code: str) -> bool:
         """
         Delete a shortened URL by its code.
         
+        As with update_url, the cache entry is evicted after the commit.
+        
         Args:
             db: Database session
             short_code: The short code of the URL to delete
@@ -302,6 +428,13 @@ class ShortenedURLService:
             URLNotFoundError: If no URL with this code exists
             URLUpdateError: If the delete operation fails
         """
+        deleted = await self._delete_url(db, short_code)
+        await self.invalidate_cached_url(short_code)
+        return deleted
+    
+    @db_transaction(db_param_name="db")
+    async def _delete_url(self, db: AsyncSession, short_code: str) -> bool:
+        """Delete a URL in its own transaction."""
         try:
             # Get the URL to delete
             url = await self.url_repository.get_by_short_code(db, short_code)
@@ -482,8 +615,17 @@ class ShortenedURLService:
         chars = settings.URL_CODE_CHARS
         if not chars:
             chars = string.ascii_letters + string.digits
-            
-        return ''.join(random.choice(chars) for _ in range(length))
+        
+        translation = _code_translation(chars)
+        if translation is None:
+            return ''.join(random.choice(chars) for _ in range(length))
+        
+        # Map random bytes in bulk, topping up for any bytes dropped as biased
+        table, delete = translation
+        code = b""
+        while len(code) < length:
+            code += os.urandom(length - len(code) + 2).translate(table, delete)
+        return code[:length].decode("ascii")
     
     def _is_valid_url(self, url) -> bool:
         """
@@ -68,8 +68,9 @@ class StatsService:
     async def track_clicks_batch(
         self,
         db: AsyncSession,
-        click_events: List[Dict[str, Any]]
-    ) -> None:
+        click_events: List[Dict[str, Any]],
+        increment_counts: bool = True
+    ) -> Dict[int, int]:
         """
         Process multiple click events in a batch for efficiency.
         
@@ -80,9 +81,15 @@ class StatsService:
                          - ip_address: Optional visitor IP address
                          - user_agent: Optional visitor user agent string
                          - clicked_at: Optional timestamp (defaults to now)
+            increment_counts: Whether to also bump ShortURL.click_count in the
+                         database. Callers that keep counters elsewhere (e.g.
+                         Redis) pass False and apply the counts later.
+        
+        Returns:
+            Dictionary mapping URL ID to the number of clicks recorded for it
         """
         if not click_events:
-            return
+            return {}
             
         # Group events by URL ID to minimize lookups
         events_by_url = {}
@@ -124,21 +131,34 @@ class StatsService:
                 })
             
             # Batch increment click counts
-            for url_id, count in click_counts.items():
-                # Simple increment for now - could optimize further with custom SQL
-                await self.url_repository.bulk_update(
-                    db, 
-                    {"id": url_id}, 
-                    {"click_count": self.url_repository.model_type.click_count + count}
-                )
+            if increment_counts:
+                await self.apply_click_counts(db, click_counts)
             
             # Batch insert click events
             if click_records:
                 await self.stats_repository.create_click_events_batch(db, click_records)
+            
+            return click_counts
         except Exception as e:
             logger.error(f"Error batch tracking clicks: {e}")
             raise StatsTrackingError(f"Failed to track clicks in batch: {str(e)}")
     
+    async def apply_click_counts(self, db: AsyncSession, click_counts: Dict[int, int]) -> None:
+        """
+        Add pre-aggregated click counts to the stored URL counters.
+        
+        Args:
+            db: Database session
+            click_counts: Dictionary mapping URL ID to the number of clicks to add
+        """
+        for url_id, count in click_counts.items():
+            # Simple increment for now - could optimize further with custom SQL
+            await self.url_repository.bulk_update(
+                db, 
+                {"id": url_id}, 
+                {"click_count": self.url_repository.model_type.click_count + count}
+            )
+    
     @db_transaction(db_param_name="db")
     async def get_url_stats(
         self, 
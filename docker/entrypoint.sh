@@ -76,7 +76,7 @@ fi
 log "Starting application..."
 if [ "$1" = "uvicorn" ] || [ -z "$1" ]; then
     # Default command if none provided
-    uvicorn app.main:app --host 0.0.0.0 --port 8000 "$@" &
+    uvicorn app.main:app --host 0.0.0.0 --port 8000 --loop uvloop "$@" &
 else
     # Run whatever command was provided
     exec "$@" &
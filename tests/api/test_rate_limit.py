@@ -0,0 +1,250 @@
+"""Tests for the rate limiting middleware."""
+
+import re
+
+import pytest
+from ratelimit import Rule
+from ratelimit.backends.base import BaseBackend
+
+from app.core.config import Settings, settings
+from app.core.rate_limit import backends
+from app.core.rate_limit.backends import ResilientRateLimitBackend
+from app.core.rate_limit.auth import custom_on_blocked, simple_auth
+from app.core.rate_limit.middleware import (
+    RATE_LIMIT_EXEMPT_PATHS,
+    RATE_LIMIT_RULES,
+    PrefixRateLimitMiddleware,
+    _literal_prefix,
+    _PrefixPattern,
+)
+
+
+class RecordingBackend(BaseBackend):
+    """Backend stand-in that records checks and returns a fixed retry_after."""
+
+    def __init__(self, retry_after: int = 0):
+        self.retry_after_value = retry_after
+        self.calls = []
+
+    async def retry_after(self, path, user, rule):
+        self.calls.append((path, user, rule.group))
+        return self.retry_after_value
+
+
+class RecordingApp:
+    """ASGI app stand-in that records the paths it served."""
+
+    def __init__(self):
+        self.paths = []
+
+    async def __call__(self, scope, receive, send):
+        self.paths.append(scope["path"])
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+
+class FakeClock:
+    """Monotonic clock stand-in advanced by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def http_scope(path, client="203.0.113.7", headers=()):
+    """Build a minimal HTTP request scope."""
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "headers": list(headers),
+        "client": (client, 12345),
+    }
+
+
+async def call(middleware, scope):
+    """Run a request through the middleware and return the response status."""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+    return messages[0]["status"]
+
+
+@pytest.mark.api
+class TestPrefixRateLimitMiddleware:
+    """Tests for path matching and exemptions in the rate limiting middleware."""
+
+    @pytest.fixture
+    def app(self):
+        """Return the app wrapped by the middleware."""
+        return RecordingApp()
+
+    def build(self, app, backend):
+        return PrefixRateLimitMiddleware(
+            app,
+            authenticate=simple_auth,
+            backend=backend,
+            config=RATE_LIMIT_RULES,
+            on_blocked=custom_on_blocked
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("path", sorted(RATE_LIMIT_EXEMPT_PATHS))
+    async def test_exempt_paths_skip_backend(self, app, path):
+        """Test health probes and favicon requests are never rate limited."""
+        backend = RecordingBackend(retry_after=30)
+        middleware = self.build(app, backend)
+
+        assert await call(middleware, http_scope(path)) == 200
+        assert backend.calls == []
+        assert app.paths == [path]
+
+    @pytest.mark.asyncio
+    async def test_exempt_paths_match_exactly(self, app):
+        """Test paths that only start with an exempt path are still limited."""
+        backend = RecordingBackend()
+        middleware = self.build(app, backend)
+        path = f"{settings.API_PREFIX}/health/anything"
+
+        await call(middleware, http_scope(path))
+
+        assert backend.calls == [(path, "203.0.113.7", "api")]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("path, group", [
+        ("/api/urls", "api"),
+        ("/api/", "api"),
+        ("/abc123", "public"),
+        ("/apifoo", "public"),
+        ("/api", "public"),
+    ])
+    async def test_prefix_selects_rule_group(self, app, path, group):
+        """Test /api/ paths get the API rules and everything else the public ones."""
+        backend = RecordingBackend()
+        middleware = self.build(app, backend)
+
+        assert await call(middleware, http_scope(path)) == 200
+        assert backend.calls == [(path, "203.0.113.7", group)]
+
+    @pytest.mark.asyncio
+    async def test_blocked_request_gets_429(self, app):
+        """Test a request over the limit gets a 429 and never reaches the app."""
+        middleware = self.build(app, RecordingBackend(retry_after=30))
+
+        assert await call(middleware, http_scope("/abc123")) == 429
+        assert app.paths == []
+
+    def test_literal_patterns_become_prefix_matchers(self):
+        """Test anchored literal patterns are matched with startswith."""
+        matcher = _literal_prefix(re.compile(r"^/api/"))
+
+        assert isinstance(matcher, _PrefixPattern)
+        assert matcher.match("/api/urls") is not None
+        assert matcher.match("/apix") is None
+
+    def test_regex_patterns_kept(self):
+        """Test patterns with regex syntax keep their compiled regex."""
+        pattern = re.compile(r"^/u/\d+")
+
+        assert _literal_prefix(pattern) is pattern
+
+
+@pytest.mark.api
+class TestSimpleAuth:
+    """Tests for rate limit client identification."""
+
+    @pytest.fixture(autouse=True)
+    def admin_ips(self, monkeypatch):
+        """Configure one admin address and one admin network."""
+        monkeypatch.setattr(
+            "app.core.rate_limit.auth.settings",
+            Settings(_env_file=None, RATE_LIMIT_ADMIN_IPS="10.0.0.1, 192.168.0.0/16")
+        )
+
+    @pytest.mark.asyncio
+    async def test_forwarded_for_identifies_client(self):
+        """Test the first X-Forwarded-For address keys the limits."""
+        scope = http_scope("/abc123", headers=[(b"x-forwarded-for", b"198.51.100.4, 10.1.1.1")])
+
+        assert await simple_auth(scope) == ("198.51.100.4", "public")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("client", ["10.0.0.1", "192.168.4.20"])
+    async def test_admin_peer_gets_admin_group(self, client):
+        """Test admin addresses and networks are matched against the peer."""
+        assert await simple_auth(http_scope("/api/urls", client=client)) == (client, "admin")
+
+    @pytest.mark.asyncio
+    async def test_forwarded_admin_address_not_trusted(self):
+        """Test an admin address in X-Forwarded-For does not bypass limits."""
+        scope = http_scope("/api/urls", headers=[(b"x-forwarded-for", b"10.0.0.1")])
+
+        assert await simple_auth(scope) == ("10.0.0.1", "api")
+
+
+@pytest.mark.api
+class TestResilientRateLimitBackend:
+    """Tests for the local block cache in the resilient backend."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        """Replace the backend module's clock with a manual one."""
+        clock = FakeClock()
+        monkeypatch.setattr(backends, "time", clock)
+        return clock
+
+    @pytest.fixture
+    def wrapped(self):
+        """Return the backend wrapped by the resilient backend."""
+        return RecordingBackend(retry_after=60)
+
+    @pytest.fixture
+    def backend(self, wrapped):
+        """Return a resilient backend that answers from the wrapped backend."""
+        backend = ResilientRateLimitBackend("redis://localhost:6379/0")
+        backend.memory_backend = wrapped
+        backend.local_block_ttl = 0.2
+        return backend
+
+    @pytest.mark.asyncio
+    async def test_block_answered_locally(self, backend, wrapped, clock):
+        """Test repeated requests right after a block skip the backend."""
+        rule = Rule(minute=30, group="public")
+
+        assert await backend.retry_after("/abc123", "203.0.113.7", rule) == 60
+        clock.now += 0.1
+        assert await backend.retry_after("/abc123", "203.0.113.7", rule) == 60
+
+        assert len(wrapped.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_block_not_cached_for_whole_window(self, backend, wrapped, clock):
+        """Test a block reported as a full window is rechecked once the local TTL ends."""
+        rule = Rule(minute=30, group="public")
+
+        # The backend reports the 60 second window, but the window resets sooner
+        assert await backend.retry_after("/abc123", "203.0.113.7", rule) == 60
+        clock.now += 0.3
+        wrapped.retry_after_value = 0
+
+        assert await backend.retry_after("/abc123", "203.0.113.7", rule) == 0
+        assert len(wrapped.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_allowed_requests_always_checked(self, backend, wrapped, clock):
+        """Test allowed requests are never answered from the cache."""
+        rule = Rule(minute=30, group="public")
+        wrapped.retry_after_value = 0
+
+        await backend.retry_after("/abc123", "203.0.113.7", rule)
+        await backend.retry_after("/abc123", "203.0.113.7", rule)
+
+        assert len(wrapped.calls) == 2
@@ -1 +1,99 @@
- 
\ No newline at end of file
+"""Tests for the redirect endpoint."""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.repositories.url_repository import URLRepository
+from app.services.click_buffer import click_buffer
+from app.services.shortener import ShortenedURLService
+from tests.utils import create_test_url, random_string, random_url
+
+
+@pytest.mark.api
+class TestRedirect:
+    """Tests for GET /{short_code}."""
+
+    @pytest.fixture
+    async def api_client(self, test_app):
+        """Return an async client bound to the test app."""
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as api_client:
+            yield api_client
+
+    @pytest.fixture(autouse=True)
+    def clicks(self, monkeypatch):
+        """Collect queued clicks instead of writing them to the database."""
+        queued = []
+        monkeypatch.setattr(
+            click_buffer, "add",
+            lambda short_code, ip_address=None, user_agent=None: queued.append(short_code)
+        )
+        return queued
+
+    @pytest.mark.asyncio
+    async def test_redirect_cache_miss(self, test_db, api_client, redis_cache, clicks):
+        """Test a cache miss redirects from the database and caches the URL."""
+        url = await create_test_url(test_db, short_code=random_string(8))
+
+        response = await api_client.get(f"/{url.short_code}", follow_redirects=False)
+
+        assert response.status_code == 307
+        assert response.headers["location"] == url.original_url
+        assert f"url:{url.short_code}" in redis_cache.data
+        assert clicks == [url.short_code]
+
+    @pytest.mark.asyncio
+    async def test_redirect_cache_hit(self, api_client, redis_cache, clicks):
+        """Test a cache hit redirects without reading the database."""
+        short_code = random_string(8)
+        target = random_url()
+        # Only the cache knows this code, so a redirect proves the hit
+        redis_cache.data[f"url:{short_code}"] = f"|{target}".encode()
+
+        response = await api_client.get(f"/{short_code}", follow_redirects=False)
+
+        assert response.status_code == 307
+        assert response.headers["location"] == target
+        assert clicks == [short_code]
+
+    @pytest.mark.asyncio
+    async def test_redirect_unknown_code(self, api_client, redis_cache, clicks):
+        """Test an unknown code returns 404 and is not counted."""
+        response = await api_client.get(f"/{random_string(8)}", follow_redirects=False)
+
+        assert response.status_code == 404
+        assert clicks == []
+
+    @pytest.mark.asyncio
+    async def test_redirect_after_update(self, test_db, api_client, redis_cache):
+        """Test a redirect follows an updated target instead of the cached one."""
+        url = await create_test_url(test_db, short_code=random_string(8))
+        await api_client.get(f"/{url.short_code}", follow_redirects=False)
+        new_target = random_url()
+
+        service = ShortenedURLService(url_repository=URLRepository())
+        await service.update_url(test_db, url.short_code, {"original_url": new_target})
+        response = await api_client.get(f"/{url.short_code}", follow_redirects=False)
+
+        assert response.status_code == 307
+        assert response.headers["location"] == new_target
+
+    @pytest.mark.asyncio
+    async def test_redirect_after_delete(self, test_db, api_client, redis_cache):
+        """Test a deleted URL stops redirecting even after it was cached."""
+        url = await create_test_url(test_db, short_code=random_string(8))
+        await api_client.get(f"/{url.short_code}", follow_redirects=False)
+
+        service = ShortenedURLService(url_repository=URLRepository())
+        await service.delete_url(test_db, url.short_code)
+        response = await api_client.get(f"/{url.short_code}", follow_redirects=False)
+
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_redirect_not_cacheable_by_default(self, test_db, api_client, redis_cache):
+        """Test redirects are not cached downstream, so every click reaches the app."""
+        url = await create_test_url(test_db, short_code=random_string(8))
+
+        response = await api_client.get(f"/{url.short_code}", follow_redirects=False)
+
+        assert response.headers["cache-control"] == "no-store"
@@ -2,6 +2,8 @@
 
 import asyncio
 import os
+from contextlib import asynccontextmanager
+
 import pytest
 import pytest_asyncio
 from typing import AsyncGenerator, Dict, Generator
@@ -14,8 +16,9 @@ from sqlalchemy.sql import text
 from sqlmodel import SQLModel
 
 from app.core.config import settings
+from app.core.redis import redis_manager
 from app.db.base import get_engine, get_session
-from app.db.session import get_db
+from app.db.session import get_db, get_db_session_factory
 from app.main import app as main_app
 # Import models to ensure they're registered with SQLModel metadata
 from app.models.url import ShortURL
@@ -82,10 +85,24 @@ def override_get_db(test_db):
 
 
 @pytest.fixture
-def test_app(override_get_db) -> FastAPI:
+def override_get_db_session_factory(test_db):
+    """Override the lazy session factory used by the redirect endpoint."""
+    @asynccontextmanager
+    async def _test_session():
+        yield test_db
+    
+    async def _override_get_db_session_factory():
+        return _test_session
+    
+    return _override_get_db_session_factory
+
+
+@pytest.fixture
+def test_app(override_get_db, override_get_db_session_factory) -> FastAPI:
     """Create FastAPI test app with overridden dependencies."""
     app = main_app
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_db_session_factory] = override_get_db_session_factory
     return app
 
 
@@ -138,7 +155,8 @@ def mock_redis():
             return self.data.get(key)
         
         async def set(self, key, value, ex=None):
-            self.data[key] = value
+            # Like the real client, values come back as bytes
+            self.data[key] = value.encode() if isinstance(value, str) else value
             if ex:
                 self.expiry[key] = ex
         
@@ -154,4 +172,18 @@ def mock_redis():
         async def close(self):
             pass
     
-    return MockRedis() 
\ No newline at end of file
+    return MockRedis() 
+
+@pytest.fixture
+def redis_cache(monkeypatch, mock_redis):
+    """Enable the URL cache, backed by the Redis mock."""
+    monkeypatch.setattr(
+        "app.services.shortener.settings",
+        settings.model_copy(update={"CACHE_ENABLED": True})
+    )
+    
+    async def _get_client():
+        return mock_redis
+    
+    monkeypatch.setattr(redis_manager, "get_client", _get_client)
+    return mock_redis
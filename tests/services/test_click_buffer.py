@@ -0,0 +1,220 @@
+"""Tests for the click buffer."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import pytest
+
+from app.core.redis import redis_manager
+from app.services.click_buffer import ClickBuffer
+
+
+class RecordingStatsService:
+    """Stats service stand-in that records the short codes of each batch."""
+
+    def __init__(self):
+        self.batches = []
+        self.release = asyncio.Event()
+        self.release.set()
+        self.entered = asyncio.Event()
+
+    async def track_clicks_batch(self, db, batch, increment_counts=True):
+        self.entered.set()
+        await self.release.wait()
+        self.batches.append([click["short_code"] for click in batch])
+        return {}
+
+
+class FakeSessionManager:
+    """SessionManager stand-in whose transactions need no database."""
+
+    @staticmethod
+    @asynccontextmanager
+    async def transaction_context():
+        yield None
+
+
+class FakeStreamClient:
+    """Redis client stand-in serving one read of stream entries to the consumer group."""
+
+    def __init__(self, buffer, entries):
+        self.buffer = buffer
+        self.responses = [[[b"clicks", entries]]]
+        self.acked = []
+
+    async def xgroup_create(self, *args, **kwargs):
+        pass
+
+    async def xautoclaim(self, *args, **kwargs):
+        return [b"0-0", [], []]
+
+    async def xreadgroup(self, *args, **kwargs):
+        if self.responses:
+            return self.responses.pop(0)
+        # Nothing left to read; let the consumer exit
+        self.buffer._stopping.set()
+        return []
+
+    async def xack(self, stream, group, *entry_ids):
+        self.acked.extend(entry_ids)
+
+
+async def wait_for_batches(stats_service, count, timeout=1.0):
+    """Wait until the stats service has recorded ``count`` batches."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while len(stats_service.batches) < count and loop.time() < deadline:
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.service
+class TestClickBuffer:
+    """Tests for batching and shutdown of the click buffer."""
+
+    @pytest.fixture(autouse=True)
+    def no_database(self, monkeypatch):
+        """Run click buffer transactions without a database."""
+        monkeypatch.setattr("app.services.click_buffer.SessionManager", FakeSessionManager)
+
+    @pytest.fixture
+    def stats_service(self):
+        """Return a recording stats service."""
+        return RecordingStatsService()
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushed_without_waiting(self, stats_service):
+        """Test a batch is written as soon as it fills up."""
+        buffer = ClickBuffer(stats_service, batch_size=3, flush_interval=60)
+        buffer.start()
+
+        for short_code in ("a", "b", "c"):
+            buffer.add(short_code)
+        await wait_for_batches(stats_service, 1)
+
+        assert stats_service.batches == [["a", "b", "c"]]
+        await buffer.stop()
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_flushed_after_interval(self, stats_service):
+        """Test clicks are written once the flush interval elapses."""
+        buffer = ClickBuffer(stats_service, batch_size=100, flush_interval=0.05)
+        buffer.start()
+
+        buffer.add("a")
+        buffer.add("b")
+        await wait_for_batches(stats_service, 1)
+
+        assert stats_service.batches == [["a", "b"]]
+        await buffer.stop()
+
+    @pytest.mark.asyncio
+    async def test_batches_split_at_batch_size(self, stats_service):
+        """Test no batch holds more than batch_size clicks."""
+        buffer = ClickBuffer(stats_service, batch_size=2, flush_interval=60)
+        buffer.start()
+
+        for short_code in ("a", "b", "c", "d", "e"):
+            buffer.add(short_code)
+        await buffer.stop()
+
+        assert [click for batch in stats_service.batches for click in batch] == ["a", "b", "c", "d", "e"]
+        assert all(len(batch) <= 2 for batch in stats_service.batches)
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_queued_clicks(self, stats_service):
+        """Test stop writes clicks still waiting for the flush interval."""
+        buffer = ClickBuffer(stats_service, batch_size=100, flush_interval=60)
+        buffer.start()
+
+        for short_code in ("a", "b", "c"):
+            buffer.add(short_code)
+        await buffer.stop()
+
+        assert stats_service.batches == [["a", "b", "c"]]
+
+    @pytest.mark.asyncio
+    async def test_stop_finishes_batch_in_flight(self, stats_service):
+        """Test a batch being written when stop is called is not lost."""
+        buffer = ClickBuffer(stats_service, batch_size=2, flush_interval=60)
+        buffer.start()
+        stats_service.release.clear()
+
+        buffer.add("a")
+        buffer.add("b")
+        await asyncio.wait_for(stats_service.entered.wait(), timeout=1.0)
+        buffer.add("c")
+
+        stopping = asyncio.create_task(buffer.stop())
+        await asyncio.sleep(0.01)
+        assert not stopping.done()
+        stats_service.release.set()
+        await asyncio.wait_for(stopping, timeout=1.0)
+
+        assert stats_service.batches == [["a", "b"], ["c"]]
+
+    @pytest.mark.asyncio
+    async def test_add_during_stop(self, stats_service):
+        """Test clicks added while stop is waiting are written and stop still returns."""
+        buffer = ClickBuffer(stats_service, batch_size=2, flush_interval=60)
+        buffer.start()
+        stats_service.release.clear()
+
+        buffer.add("a")
+        buffer.add("b")
+        await asyncio.wait_for(stats_service.entered.wait(), timeout=1.0)
+
+        stopping = asyncio.create_task(buffer.stop())
+        await asyncio.sleep(0.01)
+        buffer.add("c")
+        buffer.start()
+        stats_service.release.set()
+        await asyncio.wait_for(stopping, timeout=1.0)
+
+        assert [click for batch in stats_service.batches for click in batch] == ["a", "b", "c"]
+        assert buffer._task is None
+
+    @pytest.mark.asyncio
+    async def test_start_after_stop_does_nothing(self, stats_service):
+        """Test a stopped buffer does not spawn new consumers."""
+        buffer = ClickBuffer(stats_service, batch_size=2, flush_interval=60)
+        buffer.start()
+        await buffer.stop()
+
+        buffer.start()
+
+        assert buffer._task is None
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_new_clicks(self, stats_service):
+        """Test clicks beyond max_size are dropped instead of blocking."""
+        buffer = ClickBuffer(stats_service, batch_size=100, flush_interval=60, max_size=2)
+        buffer.start()
+
+        # The consumer has not run yet, so nothing leaves the queue meanwhile
+        for short_code in ("a", "b", "c", "d"):
+            buffer.add(short_code)
+        await buffer.stop()
+
+        assert stats_service.batches == [["a", "b"]]
+
+    @pytest.mark.asyncio
+    async def test_malformed_stream_entries_skipped(self, stats_service, monkeypatch):
+        """Test malformed stream entries are dropped and acknowledged without stopping the consumer."""
+        buffer = ClickBuffer(stats_service, batch_size=10, flush_interval=0.01, stream_key="clicks")
+        clicked_at = datetime.utcnow().isoformat().encode()
+        client = FakeStreamClient(buffer, [
+            (b"1-0", {b"c": b"good", b"ip": b"", b"ua": b"", b"t": clicked_at}),
+            (b"2-0", {b"ip": b"", b"t": clicked_at}),
+            (b"3-0", {b"c": b"late", b"t": b"yesterday"}),
+        ])
+
+        async def _get_client():
+            return client
+
+        monkeypatch.setattr(redis_manager, "get_client", _get_client)
+
+        await asyncio.wait_for(buffer._consume_stream(), timeout=1.0)
+
+        assert stats_service.batches == [["good"]]
+        assert client.acked == [b"1-0", b"2-0", b"3-0"]
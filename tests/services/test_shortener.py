@@ -1 +1,72 @@
- 
\ No newline at end of file
+"""Tests for the URL shortening service."""
+
+import pytest
+
+from app.repositories.url_repository import URLRepository
+from app.services.shortener import ShortenedURLService
+from tests.utils import create_test_url, random_string, random_url
+
+
+@pytest.mark.service
+class TestShortenedURLServiceCache:
+    """Tests for the redirect cache kept by the URL shortening service."""
+
+    @pytest.fixture
+    def service(self):
+        """Return a URL shortening service instance."""
+        return ShortenedURLService(url_repository=URLRepository())
+
+    @pytest.mark.asyncio
+    async def test_cached_redirect_round_trip(self, test_db, service, redis_cache):
+        """Test a cached URL is returned on the next lookup."""
+        url = await create_test_url(test_db, short_code=random_string(8))
+
+        await service.cache_url(url)
+
+        assert await service.get_cached_redirect(url.short_code) == (url.original_url, None)
+
+    @pytest.mark.asyncio
+    async def test_update_url_evicts_cached_redirect(self, test_db, service, redis_cache):
+        """Test updating a URL stops the old target from being served from the cache."""
+        url = await create_test_url(test_db, short_code=random_string(8))
+        await service.cache_url(url)
+        new_target = random_url()
+
+        await service.update_url(test_db, url.short_code, {"original_url": new_target})
+
+        assert await service.get_cached_redirect(url.short_code) is None
+        redirect = await service.get_url_for_redirect(test_db, url.short_code)
+        assert redirect["original_url"] == new_target
+
+    @pytest.mark.asyncio
+    async def test_delete_url_evicts_cached_redirect(self, test_db, service, redis_cache):
+        """Test deleting a URL removes its cached redirect."""
+        url = await create_test_url(test_db, short_code=random_string(8))
+        await service.cache_url(url)
+
+        assert await service.delete_url(test_db, url.short_code) is True
+
+        assert await service.get_cached_redirect(url.short_code) is None
+
+    @pytest.mark.asyncio
+    async def test_cache_evicted_after_commit(self, test_db, service, redis_cache, monkeypatch):
+        """Test the cache entry is evicted only once the update is committed."""
+        url = await create_test_url(test_db, short_code=random_string(8))
+        events = []
+        commit = test_db.commit
+        invalidate = service.invalidate_cached_url
+
+        async def _commit():
+            events.append("commit")
+            await commit()
+
+        async def _invalidate(short_code):
+            events.append("invalidate")
+            await invalidate(short_code)
+
+        monkeypatch.setattr(test_db, "commit", _commit)
+        monkeypatch.setattr(service, "invalidate_cached_url", _invalidate)
+
+        await service.update_url(test_db, url.short_code, {"original_url": random_url()})
+
+        assert events == ["commit", "invalidate"]
@@ -0,0 +1,65 @@
+"""Tests for application settings."""
+
+import pytest
+
+from app.core.config import Settings
+
+
+def make_settings(**values) -> Settings:
+    """Build settings from the given values only, ignoring any .env file."""
+    return Settings(_env_file=None, **values)
+
+
+@pytest.mark.unit
+class TestListSettings:
+    """Tests for comma-separated list settings."""
+
+    def test_items_split_and_stripped(self):
+        """Test items are split on commas with surrounding whitespace removed."""
+        config = make_settings(CORS_ORIGINS="https://a.example, https://b.example ,https://c.example")
+
+        assert config.CORS_ORIGINS_LIST == ["https://a.example", "https://b.example", "https://c.example"]
+
+    @pytest.mark.parametrize("value", ["", "   "])
+    def test_blank_value_is_empty_list(self, value):
+        """Test a blank setting yields no items."""
+        assert make_settings(RATE_LIMIT_ADMIN_API_KEYS=value).RATE_LIMIT_ADMIN_API_KEYS_LIST == []
+
+    def test_wildcard_kept_as_single_item(self):
+        """Test a lone wildcard stays a single item."""
+        assert make_settings(CORS_ORIGINS="*").CORS_ORIGINS_LIST == ["*"]
+
+    def test_single_item(self):
+        """Test a value without commas yields one item."""
+        assert make_settings(RATE_LIMIT_ADMIN_API_KEYS="key").RATE_LIMIT_ADMIN_API_KEYS_LIST == ["key"]
+
+
+@pytest.mark.unit
+class TestAdminIPs:
+    """Tests for admin address matching."""
+
+    @pytest.fixture
+    def config(self):
+        """Return settings with exact, CIDR and invalid admin entries."""
+        return make_settings(RATE_LIMIT_ADMIN_IPS="10.0.0.1, 192.168.0.0/16, 2001:db8::/32, bad/net")
+
+    def test_addresses_and_networks_separated(self, config):
+        """Test exact addresses and CIDR ranges are split apart, dropping invalid ranges."""
+        assert config.ADMIN_IP_SET == frozenset({"10.0.0.1"})
+        assert [str(network) for network in config.ADMIN_IP_NETWORKS] == ["192.168.0.0/16", "2001:db8::/32"]
+
+    @pytest.mark.parametrize("ip, expected", [
+        ("10.0.0.1", True),
+        ("10.0.0.2", False),
+        ("192.168.200.1", True),
+        ("2001:db8::1", True),
+        ("not-an-ip", False),
+        ("unknown", False),
+    ])
+    def test_is_admin_ip(self, config, ip, expected):
+        """Test exact and CIDR matches, and non-addresses never match."""
+        assert config.is_admin_ip(ip) is expected
+
+    def test_no_admin_ips(self):
+        """Test nothing matches when no admin addresses are configured."""
+        assert make_settings(RATE_LIMIT_ADMIN_IPS="").is_admin_ip("127.0.0.1") is False
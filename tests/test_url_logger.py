@@ -0,0 +1,56 @@
+"""Tests for the URL access log writer."""
+
+import os
+
+import pytest
+
+from app.core import url_logger
+from app.core.config import settings
+
+
+@pytest.mark.unit
+class TestAccessLogRotation:
+    """Tests for size-based rotation of the URL access log."""
+
+    @pytest.fixture
+    def log_path(self, tmp_path, monkeypatch):
+        """Point the writer at a temporary log that rotates after 10 bytes."""
+        path = str(tmp_path / "url_access.json")
+        monkeypatch.setattr(url_logger, "_log_path", path)
+        monkeypatch.setattr(
+            url_logger,
+            "settings",
+            settings.model_copy(update={"URL_ACCESS_LOG_MAX_BYTES": 10, "URL_ACCESS_LOG_BACKUP_COUNT": 2})
+        )
+        monkeypatch.setattr(url_logger, "_fd", url_logger._open_log())
+        yield path
+        os.close(url_logger._fd)
+
+    def test_rotates_to_fresh_file(self, log_path):
+        """Test a full log is moved to .1 and writing continues in a new file."""
+        url_logger._write(bytearray(b"x" * 20), 20)
+        url_logger._write(bytearray(b"y"), 1)
+
+        with open(f"{log_path}.1", "rb") as rotated, open(log_path, "rb") as current:
+            assert rotated.read() == b"x" * 20
+            assert current.read() == b"y"
+
+    def test_failed_rename_keeps_descriptor_open(self, log_path, monkeypatch):
+        """Test a rotation that fails to rename leaves the writer on the open log."""
+        fd = url_logger._fd
+
+        def _fail_replace(source, destination):
+            raise PermissionError(13, "Permission denied", source)
+
+        with monkeypatch.context() as patch:
+            patch.setattr(url_logger.os, "replace", _fail_replace)
+            with pytest.raises(OSError):
+                url_logger._write(bytearray(b"x" * 20), 20)
+
+        assert url_logger._fd == fd
+        os.fstat(url_logger._fd)
+
+        # The next batch rotates the log, including the bytes written meanwhile
+        url_logger._write(bytearray(b"y"), 1)
+        with open(f"{log_path}.1", "rb") as rotated:
+            assert rotated.read() == b"x" * 20 + b"y"